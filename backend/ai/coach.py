@@ -12,9 +12,12 @@ import asyncio
 import json
 import logging
 import os
-import urllib.request
+import threading
 from typing import Any, Optional
 
+import httpx
+import numpy as np
+
 logger = logging.getLogger("squatsense.ai_coach")
 
 
@@ -22,12 +25,12 @@ logger = logging.getLogger("squatsense.ai_coach")
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _safe_avg(vals: list[float | int]) -> Optional[float]:
-    """Return the mean of *vals* or None if the list is empty."""
-    numeric = [v for v in vals if v is not None]
-    if not numeric:
+def _nan_avg(vals: np.ndarray) -> Optional[float]:
+    """Return the mean of the finite entries in *vals*, or None if there are none."""
+    finite = vals[~np.isnan(vals)]
+    if finite.size == 0:
         return None
-    return sum(numeric) / len(numeric)
+    return float(finite.mean())
 
 
 def _pct(count: int, total: int) -> str:
@@ -48,10 +51,11 @@ def _collect_risk_markers(reps: list[dict[str, Any]]) -> dict[str, int]:
     """
     counts: dict[str, int] = {}
     for rep in reps:
+        get = rep.get
         has_explicit = False
 
         # Structured risk_markers dict  (e.g. {"knee_valgus": True})
-        rm = rep.get("risk_markers")
+        rm = get("risk_markers")
         if isinstance(rm, dict) and rm:
             has_explicit = True
             for key, val in rm.items():
@@ -59,7 +63,7 @@ def _collect_risk_markers(reps: list[dict[str, Any]]) -> dict[str, int]:
                     counts[key] = counts.get(key, 0) + 1
 
         # flags may be a list of strings or a dict
-        flags = rep.get("flags")
+        flags = get("flags")
         if isinstance(flags, list) and flags:
             has_explicit = True
             for flag in flags:
@@ -73,13 +77,13 @@ def _collect_risk_markers(reps: list[dict[str, Any]]) -> dict[str, int]:
 
         # Derive markers from boolean flags when no explicit markers exist
         if not has_explicit:
-            if rep.get("depth_ok") is False:
+            if get("depth_ok") is False:
                 counts["shallow_depth"] = counts.get("shallow_depth", 0) + 1
-            if rep.get("balance_ok") is False:
+            if get("balance_ok") is False:
                 counts["balance_fail"] = counts.get("balance_fail", 0) + 1
-            if rep.get("trunk_ok") is False:
+            if get("trunk_ok") is False:
                 counts["excessive_forward_lean"] = counts.get("excessive_forward_lean", 0) + 1
-            if rep.get("form_ok") is False:
+            if get("form_ok") is False:
                 counts["lumbar_rounding"] = counts.get("lumbar_rounding", 0) + 1
 
     return counts
@@ -89,6 +93,72 @@ def _collect_risk_markers(reps: list[dict[str, Any]]) -> dict[str, int]:
 # Session summary builder
 # ---------------------------------------------------------------------------
 
+# Boolean per-rep flags rolled up as "N/total" counts.
+_FLAG_KEYS = ("depth_ok", "trunk_ok", "balance_ok", "form_ok", "needs_review")
+# Flags reported as percentages on the roll-up line, with their labels.
+_PCT_FLAG_KEYS = (
+    ("depth_ok", "Depth"),
+    ("trunk_ok", "Trunk"),
+    ("balance_ok", "Balance"),
+    ("form_ok", "Form"),
+)
+
+# Numeric per-rep values averaged in the summary ("duration_sec" is appended
+# separately because it falls back to ``duration_ms``).
+_SUB_SCORE_KEYS = ("depth_score", "stability_score", "symmetry_score", "tempo_score", "rom_score")
+_ANGLE_KEYS = (
+    ("primary_angle_deg", "Primary angle"),
+    ("secondary_angle_deg", "Secondary angle"),
+    ("trunk_angle_deg", "Trunk angle"),
+    ("knee_flexion_deg", "Knee flexion"),
+)
+_VALUE_KEYS = (
+    ("composite_score",)
+    + _SUB_SCORE_KEYS
+    + tuple(key for key, _ in _ANGLE_KEYS)
+    + ("speed_proxy",)
+)
+
+# Per-set pass/fail flags shown in the per-set breakdown, and their labels.
+_SET_FLAG_KEYS = (
+    ("depth_ok", "depth"),
+    ("stability_ok", "stability"),
+    ("tempo_ok", "tempo"),
+)
+_OK_FAIL = {True: "OK", False: "FAIL"}
+
+
+def _reps_to_arrays(
+    reps: list[dict[str, Any]],
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Convert *reps* into per-key NumPy columns in a single pass.
+
+    Returns ``(flags, values)``: ``flags`` maps each of ``_FLAG_KEYS`` to a
+    bool array (True only where the rep value ``is True``), ``values`` maps
+    each of ``_VALUE_KEYS`` plus ``"duration_sec"`` to a float64 array with
+    ``NaN`` for missing entries.  Non-positive durations are treated as
+    missing.
+    """
+    n = len(reps)
+    flag_rows: list[list[bool]] = []
+    value_rows: list[list[Any]] = []
+    for rep in reps:
+        get = rep.get
+        flag_rows.append([get(key) is True for key in _FLAG_KEYS])
+        duration_ms = get("duration_ms")
+        duration = get("duration_sec") or (duration_ms / 1000.0 if duration_ms else None)
+        value_rows.append([get(key) for key in _VALUE_KEYS] + [duration])
+
+    flag_arr = np.array(flag_rows, dtype=bool).reshape(n, len(_FLAG_KEYS))
+    value_arr = np.array(value_rows, dtype=np.float64).reshape(n, len(_VALUE_KEYS) + 1)
+
+    flags = {key: flag_arr[:, i] for i, key in enumerate(_FLAG_KEYS)}
+    values = {key: value_arr[:, i] for i, key in enumerate(_VALUE_KEYS)}
+    durations = value_arr[:, -1]
+    values["duration_sec"] = np.where(durations > 0, durations, np.nan)
+    return flags, values
+
+
 def _summarize_session(
     exercise_type: str,
     reps: list[dict[str, Any]],
@@ -142,45 +212,27 @@ def _summarize_session(
     lines.append(f"Exercise: {exercise_type}")
     lines.append(f"Total reps: {total_reps}  |  Total sets: {total_sets}")
 
+    flags, values = _reps_to_arrays(reps)
+
     # --- Boolean flag roll-ups ---
     if total_reps:
-        depth_ok = sum(1 for r in reps if r.get("depth_ok") is True)
-        trunk_ok = sum(1 for r in reps if r.get("trunk_ok") is True)
-        balance_ok = sum(1 for r in reps if r.get("balance_ok") is True)
-        form_ok = sum(1 for r in reps if r.get("form_ok") is True)
-        needs_review = sum(1 for r in reps if r.get("needs_review") is True)
-        lines.append(
-            f"Depth OK: {_pct(depth_ok, total_reps)}  |  "
-            f"Trunk OK: {_pct(trunk_ok, total_reps)}  |  "
-            f"Balance OK: {_pct(balance_ok, total_reps)}  |  "
-            f"Form OK: {_pct(form_ok, total_reps)}"
-        )
+        counts = {key: int(np.count_nonzero(col)) for key, col in flags.items()}
+        lines.append("  |  ".join(
+            f"{label} OK: {_pct(counts[key], total_reps)}" for key, label in _PCT_FLAG_KEYS
+        ))
+        needs_review = counts["needs_review"]
         if needs_review:
             lines.append(f"Reps flagged for review: {needs_review}/{total_reps}")
 
     # --- Composite score ---
-    composite_vals = [r.get("composite_score") for r in reps if r.get("composite_score") is not None]
-    avg_composite = _safe_avg(composite_vals)
+    avg_composite = _nan_avg(values["composite_score"])
     if avg_composite is not None:
         lines.append(f"Avg composite score: {avg_composite:.1f}")
 
     # --- Sub-score breakdown ---
-    sub_scores = {
-        "depth_score": [],
-        "stability_score": [],
-        "symmetry_score": [],
-        "tempo_score": [],
-        "rom_score": [],
-    }
-    for rep in reps:
-        for key in sub_scores:
-            val = rep.get(key)
-            if val is not None:
-                sub_scores[key].append(val)
-
     sub_avgs: list[str] = []
-    for key, vals in sub_scores.items():
-        avg = _safe_avg(vals)
+    for key in _SUB_SCORE_KEYS:
+        avg = _nan_avg(values[key])
         if avg is not None:
             label = key.replace("_score", "").capitalize()
             sub_avgs.append(f"{label}: {avg:.1f}")
@@ -188,28 +240,19 @@ def _summarize_session(
         lines.append("Sub-score averages -- " + "  |  ".join(sub_avgs))
 
     # --- Angle / biomechanics averages ---
-    angle_keys = [
-        ("primary_angle_deg", "Primary angle"),
-        ("secondary_angle_deg", "Secondary angle"),
-        ("trunk_angle_deg", "Trunk angle"),
-        ("knee_flexion_deg", "Knee flexion"),
-    ]
     angle_parts: list[str] = []
-    for key, label in angle_keys:
-        avg = _safe_avg([r.get(key) for r in reps if r.get(key) is not None])
+    for key, label in _ANGLE_KEYS:
+        avg = _nan_avg(values[key])
         if avg is not None:
             angle_parts.append(f"{label}: {avg:.1f} deg")
     if angle_parts:
         lines.append("Avg angles -- " + "  |  ".join(angle_parts))
 
-    duration_vals = [r.get("duration_sec") or (r.get("duration_ms", 0) / 1000.0 if r.get("duration_ms") else None) for r in reps]
-    duration_vals = [d for d in duration_vals if d is not None and d > 0]
-    avg_dur = _safe_avg(duration_vals)
+    avg_dur = _nan_avg(values["duration_sec"])
     if avg_dur is not None:
         lines.append(f"Avg rep duration: {avg_dur:.2f} s")
 
-    speed_vals = [r.get("speed_proxy") for r in reps if r.get("speed_proxy") is not None]
-    avg_speed = _safe_avg(speed_vals)
+    avg_speed = _nan_avg(values["speed_proxy"])
     if avg_speed is not None:
         lines.append(f"Avg speed proxy: {avg_speed:.2f}")
 
@@ -229,16 +272,11 @@ def _summarize_session(
                 parts.append(f"fatigue_idx={fi:.2f}")
             if fr:
                 parts.append(f"fatigue_risk={fr}")
-            depth_flag = s.get("depth_ok")
-            stab_flag = s.get("stability_ok")
-            tempo_flag = s.get("tempo_ok")
-            flag_parts: list[str] = []
-            if depth_flag is not None:
-                flag_parts.append(f"depth={'OK' if depth_flag else 'FAIL'}")
-            if stab_flag is not None:
-                flag_parts.append(f"stability={'OK' if stab_flag else 'FAIL'}")
-            if tempo_flag is not None:
-                flag_parts.append(f"tempo={'OK' if tempo_flag else 'FAIL'}")
+            flag_parts = [
+                f"{label}={_OK_FAIL[bool(flag)]}"
+                for key, label in _SET_FLAG_KEYS
+                if (flag := s.get(key)) is not None
+            ]
             if flag_parts:
                 parts.append(" ".join(flag_parts))
             set_lines.append("  " + ", ".join(parts))
@@ -248,8 +286,6 @@ def _summarize_session(
     # --- Sub-score trends (first half vs second half) ---
     if total_reps >= 4:
         mid = total_reps // 2
-        first_half = reps[:mid]
-        second_half = reps[mid:]
         trend_parts: list[str] = []
         for key, label in [
             ("depth_score", "Depth"),
@@ -258,8 +294,8 @@ def _summarize_session(
             ("tempo_score", "Tempo"),
             ("composite_score", "Composite"),
         ]:
-            avg_first = _safe_avg([r.get(key) for r in first_half if r.get(key) is not None])
-            avg_second = _safe_avg([r.get(key) for r in second_half if r.get(key) is not None])
+            avg_first = _nan_avg(values[key][:mid])
+            avg_second = _nan_avg(values[key][mid:])
             if avg_first is not None and avg_second is not None:
                 delta = avg_second - avg_first
                 direction = "improved" if delta > 0 else ("declined" if delta < 0 else "stable")
@@ -345,6 +381,39 @@ def _build_prompt(
 # LLM provider calls
 # ---------------------------------------------------------------------------
 
+# Request bodies are only read by the provider APIs, so skip the whitespace
+# the default separators add after every comma and colon.
+_JSON_SEPARATORS = (",", ":")
+
+# One pooled client shared by every provider call so TCP + TLS handshakes to
+# the LLM APIs are paid once per process, not once per coaching request.
+# Calls run in worker threads via ``asyncio.to_thread``; httpx.Client is
+# thread-safe, the lock only guards lazy construction.
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """Return the shared keep-alive HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=4),
+                )
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared LLM HTTP client (called on app shutdown)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
 def _extract_openai_output_text(response: dict[str, Any]) -> str:
     """Extract generated text from an OpenAI Responses API response.
 
@@ -376,32 +445,33 @@ def _call_openai(
 ) -> Optional[str]:
     """Call the OpenAI Responses API and return the raw text response.
 
-    Uses ``urllib.request`` so that no third-party packages are required.
+    Uses the shared keep-alive client from :func:`_get_http_client`.
     Returns ``None`` on any failure (network, auth, parsing).
     """
     logger.info("Calling OpenAI Responses API: model=%s, timeout=%.1f", model, timeout)
-    body = json.dumps({"model": model, "input": prompt}).encode("utf-8")
-    req = urllib.request.Request(
-        "https://api.openai.com/v1/responses",
-        data=body,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
-    )
+    body = json.dumps(
+        {"model": model, "input": prompt}, separators=_JSON_SEPARATORS
+    ).encode("utf-8")
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        resp = _get_http_client().post(
+            "https://api.openai.com/v1/responses",
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+            },
+            timeout=timeout,
+        )
+        if resp.is_error:
+            logger.warning("OpenAI HTTP error %d: %s", resp.status_code, resp.text[:300])
+            return None
+        data = resp.json()
         text = _extract_openai_output_text(data)
         if text:
             logger.info("OpenAI returned text (%d chars)", len(text))
         else:
             logger.warning("OpenAI returned empty/unparseable response: %s", str(data)[:500])
         return text or None
-    except urllib.error.HTTPError as e:
-        logger.warning("OpenAI HTTP error %d: %s", e.code, e.read().decode("utf-8", errors="replace")[:300])
-        return None
     except Exception:
         logger.exception("OpenAI call failed")
         return None
@@ -422,21 +492,24 @@ def _call_anthropic(
             "model": "claude-sonnet-4-20250514",
             "max_tokens": 500,
             "messages": [{"role": "user", "content": prompt}],
-        }
-    ).encode("utf-8")
-    req = urllib.request.Request(
-        "https://api.anthropic.com/v1/messages",
-        data=body,
-        headers={
-            "Content-Type": "application/json",
-            "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
         },
-        method="POST",
-    )
+        separators=_JSON_SEPARATORS,
+    ).encode("utf-8")
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        resp = _get_http_client().post(
+            "https://api.anthropic.com/v1/messages",
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01",
+            },
+            timeout=timeout,
+        )
+        if resp.is_error:
+            logger.warning("Anthropic HTTP error %d: %s", resp.status_code, resp.text[:300])
+            return None
+        data = resp.json()
         # Anthropic response shape: {"content": [{"type": "text", "text": "..."}], ...}
         content = data.get("content", [])
         if isinstance(content, list) and content:
@@ -448,9 +521,6 @@ def _call_anthropic(
                     return text
         logger.warning("Anthropic returned empty/unparseable response: %s", str(data)[:500])
         return None
-    except urllib.error.HTTPError as e:
-        logger.warning("Anthropic HTTP error %d: %s", e.code, e.read().decode("utf-8", errors="replace")[:300])
-        return None
     except Exception:
         logger.exception("Anthropic call failed")
         return None
@@ -583,6 +653,12 @@ async def ai_coach_feedback(
         logger.info("AI coach disabled (AI_COACH_ENABLED=%s)", _settings.AI_COACH_ENABLED)
         return None
 
+    if not reps:
+        # Nothing for the model to analyse; skip the provider round trip
+        # and let the caller fall back to static coaching.
+        logger.info("AI coach skipped: no reps recorded for %s", exercise_type)
+        return None
+
     logger.info("AI coach enabled, generating feedback for %s (%d reps)", exercise_type, len(reps))
     summary = _summarize_session(
         exercise_type, reps, sets or [], fatigue_index, fatigue_risk,
@@ -4,8 +4,14 @@ backend.core -- Core modules for SquatSense backend.
 Pose estimation, geometry helpers, signal processing, smoothing,
 frame metrics, and rep detection.
 """
-from .pose import LandmarkIdx, PoseResult, process_frame, create_pose_detector
+from .pose import (
+    LandmarkIdx,
+    PoseResult,
+    process_frame,
+    create_pose_detector,
+)
 from .geometry import (
+    as_point_list,
     get_point,
     midpoint,
     angle_deg,
@@ -23,7 +29,7 @@ from .geometry import (
     com_proxy,
     balance_metrics,
 )
-from .smoothing import smooth_keypoints_ema, smooth_keypoints_ema_3d
+from .smoothing import OneEuroFilter, smooth_keypoints_ema, smooth_keypoints_ema_3d
 from .signal import median_filter
-from .frame_metrics import compute_frame_metrics, compute_baseline
+from .frame_metrics import compute_frame_metrics, compute_frame_metrics_batch, compute_baseline
 from .rep_detector import IncrementalRepDetector, detect_reps_batch
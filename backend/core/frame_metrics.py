@@ -7,21 +7,28 @@ calculations. Produces a metrics dict consumed by the scoring engine and
 rep detector.
 """
 import math
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+import numpy as np
 
 from .geometry import (
+    as_point_list,
+    com_offset_norm_batch,
     com_proxy,
+    com_proxy_batch,
     balance_metrics,
     hip_angle_deg,
+    hip_angle_deg_batch,
     hip_below_knee,
     hip_below_knee_3d,
-    knee_angle_deg,
-    knee_angle_deg_3d,
     knee_angles_deg_separate,
+    knee_angles_deg_separate_batch,
     knee_angles_deg_3d_separate,
     pose_valid_3d,
     trunk_angle_deg,
     trunk_angle_deg_3d,
+    trunk_angle_deg_batch,
 )
 
 # Knee flexion (deg) for "Depth OK" -- parallel or below.
@@ -31,6 +38,23 @@ MAX_TRUNK_ANGLE_DEG = 50.0
 # Additional trunk angle above baseline allowed (deg).
 TRUNK_DELTA_DEG = 20.0
 
+# Metrics of a frame without a usable pose.  Read-only so hot paths can
+# share it instead of building a fresh all-None dict per dropped frame.
+EMPTY_FRAME_METRICS: Mapping[str, None] = MappingProxyType({
+    "knee_angle_deg": None,
+    "knee_flexion_deg": None,
+    "left_knee_flexion_deg": None,
+    "right_knee_flexion_deg": None,
+    "depth_ok": None,
+    "hip_angle_deg": None,
+    "trunk_angle_deg": None,
+    "trunk_ok": None,
+    "com_offset_norm": None,
+    "balance_ok": None,
+    "form_ok": None,
+    "pose_confidence": None,
+})
+
 
 def _pose_confidence(
     knee_angle: Optional[float],
@@ -54,6 +78,15 @@ def _pose_confidence(
     return max(0.0, min(1.0, score))
 
 
+def _mean_or_either(left: Optional[float], right: Optional[float]) -> Optional[float]:
+    """Average of two optional angles, or whichever one is available."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return (left + right) / 2.0
+
+
 def _median(values: list[float]) -> Optional[float]:
     if not values:
         return None
@@ -78,45 +111,53 @@ def compute_baseline(samples: list[dict[str, Any]]) -> dict[str, Optional[float]
     }
 
 
+def trunk_threshold_deg(baseline: Optional[dict[str, Optional[float]]]) -> float:
+    """Maximum allowed trunk angle (deg) given a calibration baseline."""
+    base_trunk = baseline.get("trunk_angle_deg") if baseline else None
+    if base_trunk is None:
+        return MAX_TRUNK_ANGLE_DEG
+    return min(MAX_TRUNK_ANGLE_DEG, base_trunk + TRUNK_DELTA_DEG)
+
+
 def compute_frame_metrics(
     keypoints: Optional[list[tuple[float, float]]],
     baseline: Optional[dict[str, Optional[float]]] = None,
     keypoints_3d: Optional[list[tuple[float, float, float]]] = None,
+    trunk_threshold: Optional[float] = None,
+    valid_3d: Optional[bool] = None,
 ) -> dict[str, Optional[float] | Optional[bool]]:
     """Compute per-frame biomechanics metrics from keypoints.
 
     When ``keypoints_3d`` is provided and valid, knee angle, trunk angle,
     hip-below-knee, and depth are computed from 3D world landmarks
     (view-invariant). COM/balance stays on 2D.
+
+    Callers scoring many frames against one baseline can pass
+    ``trunk_threshold`` (from :func:`trunk_threshold_deg`) to skip
+    re-deriving it from ``baseline`` on every call, and callers that have
+    already run ``pose_valid_3d`` on ``keypoints_3d`` can pass the result
+    as ``valid_3d``.
     """
+    keypoints = as_point_list(keypoints)
+    keypoints_3d = as_point_list(keypoints_3d)
     if not keypoints:
-        return {
-            "knee_angle_deg": None,
-            "knee_flexion_deg": None,
-            "left_knee_flexion_deg": None,
-            "right_knee_flexion_deg": None,
-            "depth_ok": None,
-            "hip_angle_deg": None,
-            "trunk_angle_deg": None,
-            "trunk_ok": None,
-            "com_offset_norm": None,
-            "balance_ok": None,
-            "form_ok": None,
-            "pose_confidence": None,
-        }
-
-    use_3d = keypoints_3d is not None and pose_valid_3d(keypoints_3d)
+        return dict(EMPTY_FRAME_METRICS)
+
+    if valid_3d is None:
+        valid_3d = keypoints_3d is not None and pose_valid_3d(keypoints_3d)
+    use_3d = keypoints_3d is not None and valid_3d
 
+    # Per-knee angles are computed once and averaged here, rather than
+    # calling knee_angle_deg*, which would compute both angles again.
     if use_3d:
-        knee_angle = knee_angle_deg_3d(keypoints_3d)  # type: ignore[arg-type]
         trunk_angle = trunk_angle_deg_3d(keypoints_3d)  # type: ignore[arg-type]
         hip_below = hip_below_knee_3d(keypoints_3d)  # type: ignore[arg-type]
         left_ka, right_ka = knee_angles_deg_3d_separate(keypoints_3d)  # type: ignore[arg-type]
     else:
-        knee_angle = knee_angle_deg(keypoints)
         trunk_angle = trunk_angle_deg(keypoints)
         hip_below = hip_below_knee(keypoints)
         left_ka, right_ka = knee_angles_deg_separate(keypoints)
+    knee_angle = _mean_or_either(left_ka, right_ka)
 
     knee_flexion = (180.0 - knee_angle) if knee_angle is not None else None
     left_knee_flexion = (180.0 - left_ka) if left_ka is not None else None
@@ -128,12 +169,9 @@ def compute_frame_metrics(
     com_offset_norm, balance_ok = balance_metrics(keypoints, com)
     pose_conf = _pose_confidence(knee_angle, hip_angle, trunk_angle, com_offset_norm, hip_below)
 
-    base_trunk = baseline.get("trunk_angle_deg") if baseline else None
     depth_by_flexion = knee_flexion is not None and knee_flexion >= PARALLEL_KNEE_FLEXION_DEG
-    trunk_threshold = min(
-        MAX_TRUNK_ANGLE_DEG,
-        (base_trunk + TRUNK_DELTA_DEG) if base_trunk is not None else MAX_TRUNK_ANGLE_DEG,
-    )
+    if trunk_threshold is None:
+        trunk_threshold = trunk_threshold_deg(baseline)
     if hip_below is None:
         depth_ok = depth_by_flexion
     else:
@@ -158,3 +196,41 @@ def compute_frame_metrics(
         "form_ok": form_ok,
         "pose_confidence": pose_conf,
     }
+
+
+def _mean_knee_angle(left_ka: np.ndarray, right_ka: np.ndarray) -> np.ndarray:
+    """Mean of both knee angles per frame, or whichever one exists."""
+    return np.where(
+        np.isnan(left_ka),
+        right_ka,
+        np.where(np.isnan(right_ka), left_ka, (left_ka + right_ka) / 2.0),
+    )
+
+
+def knee_flexion_deg_batch(keypoints: np.ndarray) -> np.ndarray:
+    """Vectorized 2D ``knee_flexion_deg`` over a ``(T, K, 2)`` keypoint array.
+
+    The standing screen in calibration needs only this field, so it skips
+    the other kernels of :func:`compute_frame_metrics_batch`.
+    """
+    return 180.0 - _mean_knee_angle(*knee_angles_deg_separate_batch(keypoints))
+
+
+def compute_frame_metrics_batch(keypoints: np.ndarray) -> dict[str, np.ndarray]:
+    """Vectorized 2D angle metrics over a ``(T, K, 2)`` keypoint array.
+
+    Covers the angle fields and COM offset of :func:`compute_frame_metrics`
+    (2D path only) as 1-D arrays, with NaN where the scalar version returns
+    None.
+    """
+    left_ka, right_ka = knee_angles_deg_separate_batch(keypoints)
+    knee_angle = _mean_knee_angle(left_ka, right_ka)
+    return {
+        "knee_angle_deg": knee_angle,
+        "knee_flexion_deg": 180.0 - knee_angle,
+        "left_knee_flexion_deg": 180.0 - left_ka,
+        "right_knee_flexion_deg": 180.0 - right_ka,
+        "hip_angle_deg": hip_angle_deg_batch(keypoints),
+        "trunk_angle_deg": trunk_angle_deg_batch(keypoints),
+        "com_offset_norm": com_offset_norm_batch(keypoints, com_proxy_batch(keypoints)),
+    }
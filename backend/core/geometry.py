@@ -9,16 +9,89 @@ and pose validation. Extracted from src/reps.py and made public.
 import math
 from typing import Optional
 
-from .pose import LandmarkIdx
+import numpy as np
+
+from .pose import NUM_LANDMARKS, LandmarkIdx
+
+# Radians -> degrees; multiplying by this matches math.degrees / np.degrees
+# bit for bit without a function call per angle.
+_RAD2DEG = 180.0 / math.pi
 
 # Margin beyond foot base where COM is still considered "balanced"
 BALANCE_MARGIN = 0.05
 
+# Landmarks a pose must have to be analysed, and the list length that
+# guarantees all of them are present.
+_REQUIRED_LANDMARKS: tuple[int, ...] = (
+    LandmarkIdx.LEFT_SHOULDER, LandmarkIdx.RIGHT_SHOULDER,
+    LandmarkIdx.LEFT_HIP, LandmarkIdx.RIGHT_HIP,
+    LandmarkIdx.LEFT_KNEE, LandmarkIdx.RIGHT_KNEE,
+    LandmarkIdx.LEFT_ANKLE, LandmarkIdx.RIGHT_ANKLE,
+)
+_REQUIRED_LEN = max(_REQUIRED_LANDMARKS) + 1
+
+# Body-segment mass fractions for the COM proxy, each with the landmarks
+# (and coefficients) whose weighted average locates that segment's midpoint.
+_COM_SEGMENTS: tuple[tuple[float, tuple[tuple[int, float], ...]], ...] = (
+    # head: nose <-> shoulder midpoint
+    (0.08, (
+        (LandmarkIdx.NOSE, 0.5),
+        (LandmarkIdx.LEFT_SHOULDER, 0.25), (LandmarkIdx.RIGHT_SHOULDER, 0.25),
+    )),
+    # trunk: shoulder midpoint <-> hip midpoint
+    (0.50, (
+        (LandmarkIdx.LEFT_SHOULDER, 0.25), (LandmarkIdx.RIGHT_SHOULDER, 0.25),
+        (LandmarkIdx.LEFT_HIP, 0.25), (LandmarkIdx.RIGHT_HIP, 0.25),
+    )),
+    (0.027, ((LandmarkIdx.LEFT_SHOULDER, 0.5), (LandmarkIdx.LEFT_ELBOW, 0.5))),
+    (0.027, ((LandmarkIdx.RIGHT_SHOULDER, 0.5), (LandmarkIdx.RIGHT_ELBOW, 0.5))),
+    (0.016, ((LandmarkIdx.LEFT_ELBOW, 0.5), (LandmarkIdx.LEFT_WRIST, 0.5))),
+    (0.016, ((LandmarkIdx.RIGHT_ELBOW, 0.5), (LandmarkIdx.RIGHT_WRIST, 0.5))),
+    (0.006, ((LandmarkIdx.LEFT_WRIST, 1.0),)),
+    (0.006, ((LandmarkIdx.RIGHT_WRIST, 1.0),)),
+    (0.10, ((LandmarkIdx.LEFT_HIP, 0.5), (LandmarkIdx.LEFT_KNEE, 0.5))),
+    (0.10, ((LandmarkIdx.RIGHT_HIP, 0.5), (LandmarkIdx.RIGHT_KNEE, 0.5))),
+    (0.046, ((LandmarkIdx.LEFT_KNEE, 0.5), (LandmarkIdx.LEFT_ANKLE, 0.5))),
+    (0.046, ((LandmarkIdx.RIGHT_KNEE, 0.5), (LandmarkIdx.RIGHT_ANKLE, 0.5))),
+    (0.014, ((LandmarkIdx.LEFT_HEEL, 0.5), (LandmarkIdx.LEFT_FOOT_INDEX, 0.5))),
+    (0.014, ((LandmarkIdx.RIGHT_HEEL, 0.5), (LandmarkIdx.RIGHT_FOOT_INDEX, 0.5))),
+)
+
+
+def _com_mix() -> np.ndarray:
+    """Collapse ``_COM_SEGMENTS`` into one normalised weight per landmark."""
+    mix = np.zeros(NUM_LANDMARKS)
+    for weight, coeffs in _COM_SEGMENTS:
+        for idx, c in coeffs:
+            mix[idx] += weight * c
+    return mix / sum(weight for weight, _ in _COM_SEGMENTS)
+
+
+# COM = _COM_MIX @ keypoints for a full landmark set
+_COM_MIX = _com_mix()
+# Sparse (landmark, weight) form of _COM_MIX for the per-frame scalar path
+_COM_TERMS: tuple[tuple[int, float], ...] = tuple(
+    (int(i), float(_COM_MIX[i])) for i in np.flatnonzero(_COM_MIX)
+)
+
 
 # ---------------------------------------------------------------------------
 # 2D geometry helpers (image / pixel coordinates)
 # ---------------------------------------------------------------------------
 
+def as_point_list(keypoints):
+    """Return *keypoints* as a list of points, converting a ``(K, D)`` array.
+
+    The one-euro smoother and the live client-landmark path produce NumPy
+    arrays; the scalar helpers in this module index Python floats far faster
+    than NumPy scalars, so callers convert once per frame.  Lists (and None)
+    are returned unchanged.
+    """
+    if isinstance(keypoints, np.ndarray):
+        return keypoints.tolist()
+    return keypoints
+
+
 def get_point(
     keypoints: list[tuple[float, float]] | None,
     idx: int,
@@ -47,16 +120,15 @@ def angle_deg(
     """Angle at *b* for triangle a-b-c, in degrees."""
     if a is None or b is None or c is None:
         return None
-    ba = (a[0] - b[0], a[1] - b[1])
-    bc = (c[0] - b[0], c[1] - b[1])
-    norm_ba = math.hypot(ba[0], ba[1])
-    norm_bc = math.hypot(bc[0], bc[1])
-    denom = norm_ba * norm_bc
-    if denom < 1e-6:
-        return None
-    cos_val = (ba[0] * bc[0] + ba[1] * bc[1]) / denom
-    cos_val = max(-1.0, min(1.0, cos_val))
-    return math.degrees(math.acos(cos_val))
+    bax, bay = a[0] - b[0], a[1] - b[1]
+    bcx, bcy = c[0] - b[0], c[1] - b[1]
+    # atan2(|cross|, dot) needs no normalisation or clamping and stays
+    # accurate near 0 and 180 degrees, where acos loses precision.
+    cross = bax * bcy - bay * bcx
+    dot = bax * bcx + bay * bcy
+    if cross == 0.0 and dot == 0.0:
+        return None  # a zero-length side
+    return math.atan2(abs(cross), dot) * _RAD2DEG
 
 
 def hip_y(keypoints: list[tuple[float, float]]) -> Optional[float]:
@@ -102,7 +174,7 @@ def trunk_angle_deg(keypoints: list[tuple[float, float]]) -> Optional[float]:
     dy = shoulder_mid[1] - hip_mid[1]
     if abs(dx) + abs(dy) < 1e-6:
         return None
-    return math.degrees(math.atan2(abs(dx), abs(dy)))
+    return math.atan2(abs(dx), abs(dy)) * _RAD2DEG
 
 
 def knee_angle_deg(keypoints: list[tuple[float, float]]) -> Optional[float]:
@@ -170,27 +242,14 @@ def hip_below_knee(
 
 def pose_valid(keypoints: Optional[list[tuple[float, float]]]) -> bool:
     """Basic validity check for required landmarks and reasonable limb lengths."""
-    if not keypoints:
-        return False
-    required = [
-        LandmarkIdx.LEFT_SHOULDER,
-        LandmarkIdx.RIGHT_SHOULDER,
-        LandmarkIdx.LEFT_HIP,
-        LandmarkIdx.RIGHT_HIP,
-        LandmarkIdx.LEFT_KNEE,
-        LandmarkIdx.RIGHT_KNEE,
-        LandmarkIdx.LEFT_ANKLE,
-        LandmarkIdx.RIGHT_ANKLE,
-    ]
-    for idx in required:
-        if get_point(keypoints, idx) is None:
-            return False
-    lh = get_point(keypoints, LandmarkIdx.LEFT_HIP)
-    rh = get_point(keypoints, LandmarkIdx.RIGHT_HIP)
-    la = get_point(keypoints, LandmarkIdx.LEFT_ANKLE)
-    ra = get_point(keypoints, LandmarkIdx.RIGHT_ANKLE)
-    if lh is None or rh is None or la is None or ra is None:
+    # A 2D point is only ever missing by being out of range, so one length
+    # check covers every required landmark.
+    if not keypoints or len(keypoints) < _REQUIRED_LEN:
         return False
+    lh = keypoints[LandmarkIdx.LEFT_HIP]
+    rh = keypoints[LandmarkIdx.RIGHT_HIP]
+    la = keypoints[LandmarkIdx.LEFT_ANKLE]
+    ra = keypoints[LandmarkIdx.RIGHT_ANKLE]
     left_leg = math.hypot(lh[0] - la[0], lh[1] - la[1])
     right_leg = math.hypot(rh[0] - ra[0], rh[1] - ra[1])
     if left_leg < 1e-3 or right_leg < 1e-3:
@@ -231,16 +290,13 @@ def angle_deg_3d(
     """Angle at *b* for triangle a-b-c in 3D, in degrees."""
     if a is None or b is None or c is None:
         return None
-    ba = (a[0] - b[0], a[1] - b[1], a[2] - b[2])
-    bc = (c[0] - b[0], c[1] - b[1], c[2] - b[2])
-    norm_ba = math.sqrt(ba[0] ** 2 + ba[1] ** 2 + ba[2] ** 2)
-    norm_bc = math.sqrt(bc[0] ** 2 + bc[1] ** 2 + bc[2] ** 2)
-    denom = norm_ba * norm_bc
-    if denom < 1e-6:
-        return None
-    cos_val = (ba[0] * bc[0] + ba[1] * bc[1] + ba[2] * bc[2]) / denom
-    cos_val = max(-1.0, min(1.0, cos_val))
-    return math.degrees(math.acos(cos_val))
+    bax, bay, baz = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    bcx, bcy, bcz = c[0] - b[0], c[1] - b[1], c[2] - b[2]
+    cross = math.hypot(bay * bcz - baz * bcy, baz * bcx - bax * bcz, bax * bcy - bay * bcx)
+    dot = bax * bcx + bay * bcy + baz * bcz
+    if cross == 0.0 and dot == 0.0:
+        return None  # a zero-length side
+    return math.atan2(cross, dot) * _RAD2DEG
 
 
 def knee_angle_deg_3d(keypoints_3d: list[tuple[float, float, float]]) -> Optional[float]:
@@ -298,7 +354,7 @@ def trunk_angle_deg_3d(
         return None
     cos_val = (trunk[0] * up_vector[0] + trunk[1] * up_vector[1] + trunk[2] * up_vector[2]) / denom
     cos_val = max(-1.0, min(1.0, cos_val))
-    return math.degrees(math.acos(cos_val))
+    return math.acos(cos_val) * _RAD2DEG
 
 
 def hip_below_knee_3d(keypoints_3d: list[tuple[float, float, float]]) -> Optional[bool]:
@@ -319,27 +375,16 @@ def hip_below_knee_3d(keypoints_3d: list[tuple[float, float, float]]) -> Optiona
 
 def pose_valid_3d(keypoints_3d: Optional[list[tuple[float, float, float]]]) -> bool:
     """Validate 3D keypoints: required landmarks exist, reasonable limb lengths, no NaN."""
-    if not keypoints_3d:
+    if not keypoints_3d or len(keypoints_3d) < _REQUIRED_LEN:
         return False
-    required = [
-        LandmarkIdx.LEFT_SHOULDER, LandmarkIdx.RIGHT_SHOULDER,
-        LandmarkIdx.LEFT_HIP, LandmarkIdx.RIGHT_HIP,
-        LandmarkIdx.LEFT_KNEE, LandmarkIdx.RIGHT_KNEE,
-        LandmarkIdx.LEFT_ANKLE, LandmarkIdx.RIGHT_ANKLE,
-    ]
-    for idx in required:
-        pt = get_point_3d(keypoints_3d, idx)
-        if pt is None:
-            return False
-        if any(math.isnan(v) for v in pt):
+    for idx in _REQUIRED_LANDMARKS:
+        if any(map(math.isnan, keypoints_3d[idx])):
             return False
     # Check limb lengths are in reasonable range (meters)
-    lh = get_point_3d(keypoints_3d, LandmarkIdx.LEFT_HIP)
-    la = get_point_3d(keypoints_3d, LandmarkIdx.LEFT_ANKLE)
-    rh = get_point_3d(keypoints_3d, LandmarkIdx.RIGHT_HIP)
-    ra = get_point_3d(keypoints_3d, LandmarkIdx.RIGHT_ANKLE)
-    if lh is None or la is None or rh is None or ra is None:
-        return False
+    lh = keypoints_3d[LandmarkIdx.LEFT_HIP]
+    la = keypoints_3d[LandmarkIdx.LEFT_ANKLE]
+    rh = keypoints_3d[LandmarkIdx.RIGHT_HIP]
+    ra = keypoints_3d[LandmarkIdx.RIGHT_ANKLE]
     left_leg = math.sqrt(sum((a - b) ** 2 for a, b in zip(lh, la)))
     right_leg = math.sqrt(sum((a - b) ** 2 for a, b in zip(rh, ra)))
     if left_leg < 0.1 or left_leg > 2.0 or right_leg < 0.1 or right_leg > 2.0:
@@ -352,10 +397,10 @@ def pose_valid_3d(keypoints_3d: Optional[list[tuple[float, float, float]]]) -> b
 # COM and balance (2D projection)
 # ---------------------------------------------------------------------------
 
-def com_proxy(
+def _com_proxy_segments(
     keypoints: list[tuple[float, float]],
 ) -> Optional[tuple[float, float]]:
-    """Approximate COM from segment midpoints (2D projection)."""
+    """Segment-by-segment COM, tolerating missing landmarks."""
     nose = get_point(keypoints, LandmarkIdx.NOSE)
     ls = get_point(keypoints, LandmarkIdx.LEFT_SHOULDER)
     rs = get_point(keypoints, LandmarkIdx.RIGHT_SHOULDER)
@@ -424,6 +469,26 @@ def com_proxy(
     return (sum_x / total_w, sum_y / total_w)
 
 
+def com_proxy(
+    keypoints: list[tuple[float, float]],
+) -> Optional[tuple[float, float]]:
+    """Approximate COM from segment midpoints (2D projection).
+
+    With a full landmark set every segment exists, so the COM is a fixed
+    linear mix of landmarks (``_COM_TERMS``); partial sets fall back to the
+    segment-by-segment sum, which re-weights over the segments present.
+    """
+    if not keypoints or len(keypoints) < NUM_LANDMARKS:
+        return _com_proxy_segments(keypoints)
+    x = 0.0
+    y = 0.0
+    for idx, w in _COM_TERMS:
+        pt = keypoints[idx]
+        x += w * pt[0]
+        y += w * pt[1]
+    return (x, y)
+
+
 def balance_metrics(
     keypoints: list[tuple[float, float]],
     com: Optional[tuple[float, float]],
@@ -431,20 +496,29 @@ def balance_metrics(
     """Return (com_offset_norm, balance_ok)."""
     if com is None:
         return None, None
-    lheel = get_point(keypoints, LandmarkIdx.LEFT_HEEL)
-    rheel = get_point(keypoints, LandmarkIdx.RIGHT_HEEL)
-    lfoot = get_point(keypoints, LandmarkIdx.LEFT_FOOT_INDEX)
-    rfoot = get_point(keypoints, LandmarkIdx.RIGHT_FOOT_INDEX)
-    la = get_point(keypoints, LandmarkIdx.LEFT_ANKLE)
-    ra = get_point(keypoints, LandmarkIdx.RIGHT_ANKLE)
-
-    base_pts = [p for p in (lheel, rheel, lfoot, rfoot) if p is not None]
-    if len(base_pts) < 2:
-        base_pts = [p for p in (la, ra) if p is not None]
-    if len(base_pts) < 2:
-        return None, None
+    if keypoints and len(keypoints) >= NUM_LANDMARKS:
+        # Full landmark set: all four foot points exist, no list building.
+        xs = (
+            keypoints[LandmarkIdx.LEFT_HEEL][0],
+            keypoints[LandmarkIdx.RIGHT_HEEL][0],
+            keypoints[LandmarkIdx.LEFT_FOOT_INDEX][0],
+            keypoints[LandmarkIdx.RIGHT_FOOT_INDEX][0],
+        )
+    else:
+        lheel = get_point(keypoints, LandmarkIdx.LEFT_HEEL)
+        rheel = get_point(keypoints, LandmarkIdx.RIGHT_HEEL)
+        lfoot = get_point(keypoints, LandmarkIdx.LEFT_FOOT_INDEX)
+        rfoot = get_point(keypoints, LandmarkIdx.RIGHT_FOOT_INDEX)
+        la = get_point(keypoints, LandmarkIdx.LEFT_ANKLE)
+        ra = get_point(keypoints, LandmarkIdx.RIGHT_ANKLE)
+
+        base_pts = [p for p in (lheel, rheel, lfoot, rfoot) if p is not None]
+        if len(base_pts) < 2:
+            base_pts = [p for p in (la, ra) if p is not None]
+        if len(base_pts) < 2:
+            return None, None
+        xs = tuple(p[0] for p in base_pts)
 
-    xs = [p[0] for p in base_pts]
     base_min = min(xs)
     base_max = max(xs)
     span = base_max - base_min
@@ -455,3 +529,93 @@ def balance_metrics(
     margin = BALANCE_MARGIN * span
     ok = (base_min - margin) <= com[0] <= (base_max + margin)
     return offset_norm, ok
+
+
+# ---------------------------------------------------------------------------
+# Batched 2D helpers over (T, K, 2) keypoint arrays (NaN = missing)
+# ---------------------------------------------------------------------------
+
+def hip_y_norm_batch(keypoints: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`hip_y_norm` over a ``(T, K, 2)`` keypoint array.
+
+    Missing landmarks are NaN.  As in the scalar version, frames without
+    ankles (or with a degenerate leg) fall back to raw hip Y.
+    """
+    hip_mid = (keypoints[:, LandmarkIdx.LEFT_HIP] + keypoints[:, LandmarkIdx.RIGHT_HIP]) / 2.0
+    ankle_mid = (keypoints[:, LandmarkIdx.LEFT_ANKLE] + keypoints[:, LandmarkIdx.RIGHT_ANKLE]) / 2.0
+    hy = hip_mid[:, 1]
+    leg_len = np.hypot(hip_mid[:, 0] - ankle_mid[:, 0], hip_mid[:, 1] - ankle_mid[:, 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        norm = (hy - ankle_mid[:, 1]) / leg_len
+    return np.where(np.isnan(leg_len) | (leg_len < 1e-6), hy, norm)
+
+
+def angle_deg_batch(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`angle_deg` over ``(T, 2)`` point arrays; NaN where undefined."""
+    ba = a - b
+    bc = c - b
+    cross = ba[:, 0] * bc[:, 1] - ba[:, 1] * bc[:, 0]
+    dot = ba[:, 0] * bc[:, 0] + ba[:, 1] * bc[:, 1]
+    out = np.arctan2(np.abs(cross), dot)
+    out *= _RAD2DEG
+    out[(cross == 0.0) & (dot == 0.0)] = np.nan
+    return out
+
+
+def knee_angles_deg_separate_batch(keypoints: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized :func:`knee_angles_deg_separate`: (left, right) per frame."""
+    left = angle_deg_batch(
+        keypoints[:, LandmarkIdx.LEFT_HIP],
+        keypoints[:, LandmarkIdx.LEFT_KNEE],
+        keypoints[:, LandmarkIdx.LEFT_ANKLE],
+    )
+    right = angle_deg_batch(
+        keypoints[:, LandmarkIdx.RIGHT_HIP],
+        keypoints[:, LandmarkIdx.RIGHT_KNEE],
+        keypoints[:, LandmarkIdx.RIGHT_ANKLE],
+    )
+    return left, right
+
+
+def trunk_angle_deg_batch(keypoints: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`trunk_angle_deg` (degrees from vertical)."""
+    shoulder_mid = (
+        keypoints[:, LandmarkIdx.LEFT_SHOULDER] + keypoints[:, LandmarkIdx.RIGHT_SHOULDER]
+    ) / 2.0
+    hip_mid = (keypoints[:, LandmarkIdx.LEFT_HIP] + keypoints[:, LandmarkIdx.RIGHT_HIP]) / 2.0
+    dx = np.abs(shoulder_mid[:, 0] - hip_mid[:, 0])
+    dy = np.abs(shoulder_mid[:, 1] - hip_mid[:, 1])
+    out = np.arctan2(dx, dy)
+    out *= _RAD2DEG
+    out[dx + dy < 1e-6] = np.nan
+    return out
+
+
+def hip_angle_deg_batch(keypoints: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`hip_angle_deg` (shoulder-hip-knee)."""
+    shoulder_mid = (
+        keypoints[:, LandmarkIdx.LEFT_SHOULDER] + keypoints[:, LandmarkIdx.RIGHT_SHOULDER]
+    ) / 2.0
+    hip_mid = (keypoints[:, LandmarkIdx.LEFT_HIP] + keypoints[:, LandmarkIdx.RIGHT_HIP]) / 2.0
+    knee_mid = (keypoints[:, LandmarkIdx.LEFT_KNEE] + keypoints[:, LandmarkIdx.RIGHT_KNEE]) / 2.0
+    return angle_deg_batch(shoulder_mid, hip_mid, knee_mid)
+
+
+def com_proxy_batch(keypoints: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`com_proxy`: ``(T, 2)`` COM, NaN where a landmark is missing."""
+    return np.einsum("k,tkc->tc", _COM_MIX, keypoints)
+
+
+def com_offset_norm_batch(keypoints: np.ndarray, com: np.ndarray) -> np.ndarray:
+    """Vectorized COM offset from the foot-base centre (see :func:`balance_metrics`)."""
+    base_x = keypoints[:, [
+        LandmarkIdx.LEFT_HEEL, LandmarkIdx.RIGHT_HEEL,
+        LandmarkIdx.LEFT_FOOT_INDEX, LandmarkIdx.RIGHT_FOOT_INDEX,
+    ], 0]
+    base_min = base_x.min(axis=1)
+    base_max = base_x.max(axis=1)
+    span = base_max - base_min
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (com[:, 0] - (base_min + base_max) / 2.0) / span
+    out[span < 1e-6] = np.nan
+    return out
@@ -5,18 +5,28 @@ MediaPipe Pose estimation. Returns keypoints in image coordinates (pixel)
 and 3D world landmarks (meters, hip-centered) when available.
 Uses Pose Landmarker task (MediaPipe 0.10+). CPU-only, suitable for macOS.
 """
+import hashlib
+import logging
 import os
+import tempfile
 import urllib.request
+from pathlib import Path
 from typing import Any, Optional, TypedDict
 
 import cv2
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 class PoseResult(TypedDict):
     keypoints_2d: list[tuple[float, float]]
     keypoints_3d: Optional[list[tuple[float, float, float]]]
 
+# Landmarks per pose in the MediaPipe Pose topology
+NUM_LANDMARKS = 33
+
+
 # MediaPipe Pose landmark indices (same as PoseLandmark)
 class LandmarkIdx:
     NOSE = 0
@@ -41,30 +51,86 @@ class LandmarkIdx:
 # Pose Landmarker model URL (lite = faster, CPU-friendly)
 _POSE_MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task"
 _POSE_MODEL_FILENAME = "pose_landmarker_lite.task"
+_DEFAULT_MODEL_DIR = Path(__file__).parent.parent / "outputs"
+_DOWNLOAD_CHUNK_BYTES = 1 << 20
+_DOWNLOAD_TIMEOUT_SEC = 60
+# Expected SHA-256 of the model file.  A download that does not match is
+# discarded before it can replace the cached model.
+_POSE_MODEL_SHA256 = os.getenv("POSE_MODEL_SHA256", "").strip().lower()
+
+# The landmarker resizes its input to 256x256 internally, so wider frames
+# are first shrunk by an integer factor to at most this width.  Landmarks are
+# normalised, so pixel coordinates are still reported for the original frame.
+# Override with the POSE_MAX_INPUT_WIDTH env var or per detector via
+# ``create_pose_detector(max_input_width=...)``; 0 disables the downscale.
+_MAX_POSE_INPUT_WIDTH = int(os.getenv("POSE_MAX_INPUT_WIDTH", "640"))
+
+
+def _download_model(path: Path) -> None:
+    """Stream the model into a temp file beside *path*, then rename it into place.
+
+    An interrupted download never leaves a truncated model at *path* for the
+    next start to load, and concurrent workers each write their own temp file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out, urllib.request.urlopen(
+            _POSE_MODEL_URL, timeout=_DOWNLOAD_TIMEOUT_SEC,
+        ) as resp:
+            while chunk := resp.read(_DOWNLOAD_CHUNK_BYTES):
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        if _POSE_MODEL_SHA256 and sha256 != _POSE_MODEL_SHA256:
+            raise RuntimeError(
+                f"Pose model checksum mismatch: expected {_POSE_MODEL_SHA256}, got {sha256}"
+            )
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    if _POSE_MODEL_SHA256:
+        logger.info("Downloaded pose model to %s (sha256 verified)", path)
+    else:
+        logger.warning(
+            "Downloaded pose model to %s without a pinned checksum; "
+            "set POSE_MODEL_SHA256=%s to verify future downloads", path, sha256,
+        )
 
 
 def _get_model_path(cache_dir: Optional[str] = None) -> str:
     """Return path to pose landmarker model, downloading if needed."""
-    if cache_dir is None:
-        cache_dir = os.path.join(os.path.dirname(__file__), "..", "outputs")
-    os.makedirs(cache_dir, exist_ok=True)
-    path = os.path.join(cache_dir, _POSE_MODEL_FILENAME)
-    if not os.path.isfile(path):
-        urllib.request.urlretrieve(_POSE_MODEL_URL, path)
-    return path
+    path = (_DEFAULT_MODEL_DIR if cache_dir is None else Path(cache_dir)) / _POSE_MODEL_FILENAME
+    if not path.is_file():
+        # Only touch the directory when the model actually has to be fetched;
+        # the common case (model cached) is a single stat.
+        _download_model(path)
+    return str(path)
+
 
+def _create_landmarker(cache_dir: Optional[str] = None, video_mode: bool = False):
+    """Create PoseLandmarker instance (MediaPipe 0.10+ tasks API).
 
-def _create_landmarker(cache_dir: Optional[str] = None):
-    """Create PoseLandmarker instance (MediaPipe 0.10+ tasks API)."""
+    ``video_mode`` selects the VIDEO running mode, which tracks the pose
+    across consecutive frames instead of re-running full detection on each
+    one. Frames must then be passed with increasing timestamps.
+    """
     from mediapipe.tasks.python.core import base_options
     from mediapipe.tasks.python.vision import PoseLandmarker, PoseLandmarkerOptions
     from mediapipe.tasks.python.vision.core import vision_task_running_mode
 
+    running_mode = (
+        vision_task_running_mode.VisionTaskRunningMode.VIDEO
+        if video_mode
+        else vision_task_running_mode.VisionTaskRunningMode.IMAGE
+    )
     model_path = _get_model_path(cache_dir)
     base = base_options.BaseOptions(model_asset_path=model_path)
     options = PoseLandmarkerOptions(
         base_options=base,
-        running_mode=vision_task_running_mode.VisionTaskRunningMode.IMAGE,
+        running_mode=running_mode,
         num_poses=1,
         min_pose_detection_confidence=0.5,
         min_pose_presence_confidence=0.5,
@@ -73,25 +139,69 @@ def _create_landmarker(cache_dir: Optional[str] = None):
     return PoseLandmarker.create_from_options(options)
 
 
+def _cached_buffer(pose, attr: str, shape: tuple[int, ...]) -> np.ndarray:
+    """Return a uint8 scratch buffer of *shape* cached on *pose* as *attr*.
+
+    Each detector is driven by one caller at a time and MediaPipe copies its
+    input into its own image frame, so the buffer can be reused every frame.
+    """
+    buf = getattr(pose, attr, None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        setattr(pose, attr, buf)
+    return buf
+
+
+def _downscale_for_pose(frame_bgr: np.ndarray, pose) -> np.ndarray:
+    """Shrink *frame_bgr* by an integer factor to fit the detector's max width.
+
+    The limit is the ``max_input_width`` given to :func:`create_pose_detector`
+    (``_MAX_POSE_INPUT_WIDTH`` by default).  Integer ratios take OpenCV's
+    fast INTER_AREA path.
+    """
+    max_width = getattr(pose, "_max_input_width", _MAX_POSE_INPUT_WIDTH)
+    h, w = frame_bgr.shape[:2]
+    if not max_width or w <= max_width:
+        return frame_bgr
+    factor = -(-w // max_width)  # ceil division
+    shape = (h // factor, w // factor, frame_bgr.shape[2])
+    buf = _cached_buffer(pose, "_resize_buf", shape)
+    return cv2.resize(frame_bgr, (shape[1], shape[0]), dst=buf, interpolation=cv2.INTER_AREA)
+
+
 def process_frame(
     frame_bgr: np.ndarray,
     pose,  # PoseLandmarker or legacy mp.solutions.pose.Pose
+    timestamp_ms: Optional[int] = None,
+    is_rgb: bool = False,
 ) -> Optional[PoseResult]:
     """
-    Run pose estimation on one BGR frame.
+    Run pose estimation on one BGR frame (RGB when ``is_rgb`` is set).
     Returns a PoseResult dict with:
       - keypoints_2d: list of (x, y) in pixel coords for 33 landmarks
       - keypoints_3d: list of (x, y, z) in meters (hip-centered), or None
     Returns None when no pose is detected.
+    Pass ``timestamp_ms`` when *pose* was created with ``video_mode=True``.
+    Callers that decode straight to RGB pass ``is_rgb=True`` to skip the
+    colour conversion pass.
     """
     h, w = frame_bgr.shape[:2]
-    rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    small = _downscale_for_pose(frame_bgr, pose)
+    if is_rgb:
+        rgb = small
+    else:
+        rgb = cv2.cvtColor(
+            small, cv2.COLOR_BGR2RGB, dst=_cached_buffer(pose, "_rgb_buf", small.shape),
+        )
 
     # MediaPipe 0.10+ PoseLandmarker
     if hasattr(pose, "detect"):
         from mediapipe.tasks.python.vision.core import image as mp_image
         mp_img = mp_image.Image(image_format=mp_image.ImageFormat.SRGB, data=rgb)
-        result = pose.detect(mp_img)
+        if timestamp_ms is not None:
+            result = pose.detect_for_video(mp_img, timestamp_ms)
+        else:
+            result = pose.detect(mp_img)
         if not result.pose_landmarks or len(result.pose_landmarks) == 0:
             return None
         landmarks = result.pose_landmarks[0]
@@ -124,19 +234,28 @@ def create_pose_detector(
     min_tracking_confidence: float = 0.5,
     model_complexity: int = 1,
     cache_dir: Optional[str] = None,
+    video_mode: bool = False,
+    max_input_width: Optional[int] = None,
 ):
     """
     Create pose detector. Uses MediaPipe 0.10+ PoseLandmarker (CPU-friendly).
     Legacy model_complexity is ignored with the new API (we use lite model).
+    ``video_mode`` creates a tracking detector for offline video; frames must
+    then go through ``process_frame`` with strictly increasing timestamps.
+    ``max_input_width`` caps the width of frames handed to the model
+    (default ``_MAX_POSE_INPUT_WIDTH``; 0 keeps full resolution).
     """
     try:
-        return _create_landmarker(cache_dir)
+        pose = _create_landmarker(cache_dir, video_mode=video_mode)
     except Exception:
         # Fallback: try legacy API (MediaPipe < 0.10)
         import mediapipe as mp
-        return mp.solutions.pose.Pose(
+        pose = mp.solutions.pose.Pose(
             static_image_mode=False,
             model_complexity=min(model_complexity, 2),
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
         )
+    if max_input_width is not None:
+        pose._max_input_width = max_input_width
+    return pose
@@ -7,17 +7,26 @@ and angle computation, backend.core.frame_metrics for per-frame metrics,
 and backend.core.signal for median filtering.
 """
 import logging
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 
 import numpy as np
 
 from .geometry import (
+    as_point_list,
     hip_y_norm,
+    hip_y_norm_batch,
     knee_angle_deg_3d,
     pose_valid,
     pose_valid_3d,
 )
-from .frame_metrics import compute_baseline, compute_frame_metrics
+from .frame_metrics import (
+    EMPTY_FRAME_METRICS,
+    compute_baseline,
+    compute_frame_metrics,
+    knee_flexion_deg_batch,
+    trunk_threshold_deg,
+)
+from .pose import NUM_LANDMARKS
 from .signal import median_filter
 
 logger = logging.getLogger(__name__)
@@ -32,6 +41,26 @@ PEAK_PROMINENCE_FRAC = 0.10
 SIGNAL_SMOOTH_WINDOW = 5
 
 
+def _series_to_array(
+    keypoints_series: list[Optional[list[tuple[float, float]]]],
+) -> np.ndarray:
+    """Stack a 2D keypoint series into a ``(T, K, 2)`` array; missing points are NaN."""
+    arr = np.full((len(keypoints_series), NUM_LANDMARKS, 2), np.nan)
+    full: list[int] = []
+    for i, kp in enumerate(keypoints_series):
+        if kp is None or len(kp) == 0:
+            continue
+        if len(kp) >= NUM_LANDMARKS:
+            full.append(i)
+        else:
+            arr[i, :len(kp)] = kp
+    if full:
+        arr[full] = np.asarray(
+            [keypoints_series[i][:NUM_LANDMARKS] for i in full], dtype=float,
+        )
+    return arr
+
+
 def detect_reps_batch(
     keypoints_series: list[Optional[list[tuple[float, float]]]],
     fps: float,
@@ -44,6 +73,8 @@ def detect_reps_batch(
     rep signal (view-invariant) and passes 3D to metrics.
     Returns (rep_annotations, signal_curve).
     """
+    if keypoints_3d_series is not None:
+        keypoints_3d_series = [as_point_list(kp3) for kp3 in keypoints_3d_series]
     have_3d = (
         keypoints_3d_series is not None
         and len(keypoints_3d_series) == len(keypoints_series)
@@ -51,53 +82,64 @@ def detect_reps_batch(
 
     # Decide signal mode: 3D knee flexion vs 2D hip-Y-norm
     use_3d_signal = False
+    valid_3d: Optional[list[bool]] = None
     if have_3d:
-        n_valid_3d = sum(
-            1 for kp3 in keypoints_3d_series  # type: ignore[union-attr]
-            if kp3 is not None and pose_valid_3d(kp3)
-        )
+        valid_3d = [
+            kp3 is not None and pose_valid_3d(kp3)
+            for kp3 in keypoints_3d_series  # type: ignore[union-attr]
+        ]
+        n_valid_3d = sum(valid_3d)
         n_total = len(keypoints_series)
         use_3d_signal = n_valid_3d > n_total * 0.3 and n_valid_3d >= 5
 
-    ys = []
-    for i, kp in enumerate(keypoints_series):
-        if use_3d_signal:
-            kp3 = keypoints_3d_series[i] if keypoints_3d_series else None  # type: ignore[index]
-            if kp3 is not None and pose_valid_3d(kp3):
-                ka = knee_angle_deg_3d(kp3)
-                flex = (180.0 - ka) if ka is not None else np.nan
-                ys.append(flex)
-            else:
-                ys.append(np.nan)
-        else:
-            y = hip_y_norm(kp) if kp else np.nan
-            ys.append(y)
-    ys_arr = np.array(ys, dtype=float)
+    kp_arr: Optional[np.ndarray] = None
+    if use_3d_signal:
+        ys = []
+        for kp3, ok in zip(keypoints_3d_series, valid_3d):  # type: ignore[arg-type]
+            ka = knee_angle_deg_3d(kp3) if ok else None
+            ys.append((180.0 - ka) if ka is not None else np.nan)
+        ys_arr = np.array(ys, dtype=float)
+    else:
+        # One vectorized pass over the whole (T, K, 2) series
+        kp_arr = _series_to_array(keypoints_series)
+        ys_arr = hip_y_norm_batch(kp_arr)
     valid = np.isfinite(ys_arr)
     if not np.any(valid):
         return [], ys_arr.tolist()
 
     # Calibration baseline from early valid frames
     calib_samples: list[dict[str, Any]] = []
-    for idx in range(min(len(keypoints_series), max(10, CALIBRATION_FRAMES * 2))):
-        kp = keypoints_series[idx]
+    n_calib = min(len(keypoints_series), max(10, CALIBRATION_FRAMES * 2))
+    # Without 3D the standing check is 2D knee flexion alone, so screen the
+    # whole window in one vectorized call and only build dicts for survivors.
+    standing: Optional[np.ndarray] = None
+    if kp_arr is not None and not have_3d:
+        flex = knee_flexion_deg_batch(kp_arr[:n_calib])
+        standing = flex <= STANDING_KNEE_FLEXION_MAX
+    for idx in range(n_calib):
+        if standing is not None and not standing[idx]:
+            continue
+        kp = as_point_list(keypoints_series[idx])
         if not pose_valid(kp):
             continue
         kp3 = keypoints_3d_series[idx] if have_3d and keypoints_3d_series else None  # type: ignore[index]
-        m = compute_frame_metrics(kp, baseline=None, keypoints_3d=kp3)
+        m = compute_frame_metrics(
+            kp, baseline=None, keypoints_3d=kp3,
+            valid_3d=valid_3d[idx] if valid_3d is not None else None,
+        )
         kf = m.get("knee_flexion_deg")
         if kf is None or kf > STANDING_KNEE_FLEXION_MAX:
             continue
         calib_samples.append(m)
     baseline = compute_baseline(calib_samples) if calib_samples else None
+    trunk_threshold = trunk_threshold_deg(baseline)
 
     reps: list[dict[str, Any]] = []
     n = len(ys_arr)
     from scipy.signal import find_peaks
 
     ys_smooth = median_filter(ys_arr, SIGNAL_SMOOTH_WINDOW)
-    p05 = np.nanpercentile(ys_smooth, 5)
-    p95 = np.nanpercentile(ys_smooth, 95)
+    p05, p95 = np.nanpercentile(ys_smooth, (5, 95))
     prom = PEAK_PROMINENCE_FRAC * max(1e-6, (p95 - p05))
     peaks, _ = find_peaks(ys_smooth, distance=min_frames_between_peaks, prominence=prom)
     troughs, _ = find_peaks(-ys_smooth, distance=min_frames_between_peaks, prominence=prom)
@@ -114,7 +156,11 @@ def detect_reps_batch(
             if have_3d and keypoints_3d_series and bottom_f < n
             else None
         )
-        metrics = compute_frame_metrics(kp_bottom, baseline=baseline, keypoints_3d=kp3_bottom)
+        metrics = compute_frame_metrics(
+            kp_bottom, baseline=baseline, keypoints_3d=kp3_bottom,
+            trunk_threshold=trunk_threshold,
+            valid_3d=valid_3d[bottom_f] if valid_3d is not None and bottom_f < n else None,
+        )
         duration_sec = (end_f - start_f) / fps if fps > 0 else None
         speed_proxy = 1.0 / duration_sec if duration_sec and duration_sec > 0 else None
         pose_conf = metrics.get("pose_confidence")
@@ -157,17 +203,19 @@ class IncrementalRepDetector:
         self.min_tp = min_frames_trough_to_peak
         self.min_frames_between_reps = min_frames_between_reps
         self.min_knee_flexion_deg = min_knee_flexion_deg
-        self.signal_buffer: list[float] = []
-        self.keypoint_buffer: list[Optional[list[tuple[float, float]]]] = []
-        self.keypoint_3d_buffer: list[Optional[list[tuple[float, float, float]]]] = []
+        # The signal window lives in one preallocated array, oldest first,
+        # with the newest sample at the end; the live part is the last
+        # ``_signal_len`` entries, so push never allocates a new buffer.
+        self._signal = np.full(window_size, np.nan)
+        self._signal_len = 0
         self.rep_count = 0
         self.last_phase: str = "TOP_READY"
         self.confirmed_reps: list[dict[str, Any]] = []
-        self._last_peak_idx: Optional[int] = -1
-        self._last_trough_idx: Optional[int] = -1
         self._last_confirmed_end_frame: Optional[int] = None
         self._calib_samples: list[dict[str, Any]] = []
         self.baseline: Optional[dict[str, Optional[float]]] = None
+        # Trunk limit derived from the baseline, fixed once calibrated
+        self._trunk_threshold = trunk_threshold_deg(None)
         self.calibrated = False
         self._use_3d_signal: bool = False
         self._calib_3d_count: int = 0
@@ -182,17 +230,14 @@ class IncrementalRepDetector:
         self._ascent_start_frame: Optional[int] = None
 
     def reset(self) -> None:
-        self.signal_buffer.clear()
-        self.keypoint_buffer.clear()
-        self.keypoint_3d_buffer.clear()
+        self._signal_len = 0
         self.rep_count = 0
         self.last_phase = "TOP_READY"
         self.confirmed_reps.clear()
-        self._last_peak_idx = -1
-        self._last_trough_idx = -1
         self._last_confirmed_end_frame = None
         self._calib_samples.clear()
         self.baseline = None
+        self._trunk_threshold = trunk_threshold_deg(None)
         self.calibrated = False
         self._use_3d_signal = False
         self._calib_3d_count = 0
@@ -205,13 +250,24 @@ class IncrementalRepDetector:
         self._bottom_entry_frame = None
         self._ascent_start_frame = None
 
+    def _push_signal(self, y: float) -> None:
+        """Append *y* to the signal window, dropping the oldest sample when full."""
+        self._signal[:-1] = self._signal[1:]
+        self._signal[-1] = y
+        self._signal_len = min(self._signal_len + 1, self.window_size)
+
     def _signal_value(
         self,
         keypoints: Optional[list[tuple[float, float]]],
         keypoints_3d: Optional[list[tuple[float, float, float]]],
+        valid_3d: bool,
     ) -> float:
-        """Compute the rep-phase signal value using the locked signal mode."""
-        if self._use_3d_signal and keypoints_3d is not None and pose_valid_3d(keypoints_3d):
+        """Compute the rep-phase signal value using the locked signal mode.
+
+        ``valid_3d`` is ``pose_valid_3d(keypoints_3d)``, already computed by
+        the caller.
+        """
+        if self._use_3d_signal and valid_3d:
             ka = knee_angle_deg_3d(keypoints_3d)
             return (180.0 - ka) if ka is not None else np.nan
         return hip_y_norm(keypoints) if keypoints else np.nan
@@ -224,27 +280,30 @@ class IncrementalRepDetector:
         keypoints_3d: Optional[list[tuple[float, float, float]]] = None,
     ) -> dict[str, Any]:
         """Push one frame. Returns current state for overlay."""
+        keypoints = as_point_list(keypoints)
+        keypoints_3d = as_point_list(keypoints_3d)
         valid_pose = pose_valid(keypoints)
         valid_3d = keypoints_3d is not None and pose_valid_3d(keypoints_3d)
 
-        y = self._signal_value(keypoints, keypoints_3d)
+        y = self._signal_value(keypoints, keypoints_3d, valid_3d)
 
-        self.signal_buffer.append(y if np.isfinite(y) else np.nan)
-        self.keypoint_buffer.append(keypoints)
-        self.keypoint_3d_buffer.append(keypoints_3d)
+        self._push_signal(y if np.isfinite(y) else np.nan)
 
-        if len(self.signal_buffer) > self.window_size:
-            self.signal_buffer.pop(0)
-            self.keypoint_buffer.pop(0)
-            self.keypoint_3d_buffer.pop(0)
-
-        buf = np.array(self.signal_buffer, dtype=float)
-        n = len(buf)
-        metrics = compute_frame_metrics(
-            keypoints if valid_pose else None,
-            baseline=self.baseline,
-            keypoints_3d=keypoints_3d if valid_3d else None,
-        )
+        n = self._signal_len
+        buf = self._signal[self.window_size - n:]
+        # Computed once per frame; calibration and bottom tracking reuse it
+        # whenever the pose is valid instead of recomputing the same frame.
+        metrics: Mapping[str, Any]
+        if valid_pose:
+            metrics = compute_frame_metrics(
+                keypoints,
+                baseline=self.baseline,
+                keypoints_3d=keypoints_3d if valid_3d else None,
+                valid_3d=valid_3d,
+                trunk_threshold=self._trunk_threshold,
+            )
+        else:
+            metrics = EMPTY_FRAME_METRICS
         speed = None
         status = "Tracking"
 
@@ -260,22 +319,19 @@ class IncrementalRepDetector:
             }
 
         if valid_pose and not self.calibrated:
-            m = compute_frame_metrics(
-                keypoints, baseline=None,
-                keypoints_3d=keypoints_3d if valid_3d else None,
-            )
-            kf = m.get("knee_flexion_deg")
+            # Before calibration the baseline is None, so the overlay metrics
+            # above are exactly the calibration sample for this frame.
+            kf = metrics.get("knee_flexion_deg")
             if kf is not None and kf <= STANDING_KNEE_FLEXION_MAX:
-                self._calib_samples.append(m)
+                self._calib_samples.append(metrics)
                 if valid_3d:
                     self._calib_3d_count += 1
             if len(self._calib_samples) >= CALIBRATION_FRAMES:
                 self.baseline = compute_baseline(self._calib_samples)
+                self._trunk_threshold = trunk_threshold_deg(self.baseline)
                 self.calibrated = True
                 self._use_3d_signal = self._calib_3d_count > len(self._calib_samples) // 2
-                self.signal_buffer.clear()
-                self.keypoint_buffer.clear()
-                self.keypoint_3d_buffer.clear()
+                self._signal_len = 0
                 logger.info(
                     "live_rep: calibrated (baseline knee_flex=%s, use_3d_signal=%s)",
                     self.baseline.get("knee_flexion_deg"),
@@ -322,33 +378,23 @@ class IncrementalRepDetector:
                 "phase": self.last_phase,
             }
 
+        # Forward-fill gaps from the previous valid sample; leading gaps take
+        # the first valid sample.
         valid_mask = np.isfinite(buf)
-        buf_fill = buf.copy()
-        if np.any(valid_mask):
-            last_valid = np.where(valid_mask)[0]
-            for i in range(n):
-                if not valid_mask[i]:
-                    idx = np.searchsorted(last_valid, i)
-                    if idx == 0:
-                        buf_fill[i] = buf[last_valid[0]]
-                    elif idx >= len(last_valid):
-                        buf_fill[i] = buf[last_valid[-1]]
-                    else:
-                        buf_fill[i] = buf[last_valid[idx - 1]]
-
-        from scipy.signal import find_peaks
+        fill_idx = np.where(valid_mask, np.arange(n), 0)
+        np.maximum.accumulate(fill_idx, out=fill_idx)
+        buf_fill = buf[fill_idx]
+        if valid_mask.any():
+            first = int(valid_mask.argmax())
+            buf_fill[:first] = buf[first]
 
         buf_smooth = median_filter(buf_fill, SIGNAL_SMOOTH_WINDOW)
-        p05 = np.nanpercentile(buf_smooth, 5)
-        p95 = np.nanpercentile(buf_smooth, 95)
-        prom = PEAK_PROMINENCE_FRAC * max(1e-6, (p95 - p05))
-        peaks, _ = find_peaks(buf_smooth, distance=self.min_tp, prominence=prom)
-        troughs, _ = find_peaks(-buf_smooth, distance=self.min_pt, prominence=prom)
+        # The phase machine below only needs the current sample and the
+        # window's 10th/90th percentiles; no peak search is required.
+        low, high = np.nanpercentile(buf_smooth, (10, 90))
 
         y_curr = buf_smooth[-1] if np.isfinite(buf_smooth[-1]) else None
         if y_curr is not None:
-            low = np.nanpercentile(buf_smooth, 10)
-            high = np.nanpercentile(buf_smooth, 90)
             span = max(0.12, high - low)
             top_thresh = low + 0.38 * span
             bottom_thresh = low + 0.58 * span
@@ -382,10 +428,7 @@ class IncrementalRepDetector:
                     self.last_phase = "BOTTOM"
                     self._bottom_entry_frame = frame_idx
                     self._current_bottom_frame = frame_idx
-                    self._current_bottom_metrics = compute_frame_metrics(
-                        keypoints, baseline=self.baseline,
-                        keypoints_3d=keypoints_3d if valid_3d else None,
-                    )
+                    self._current_bottom_metrics = metrics
                     self._current_bottom_y = y_curr
                     status = "Bottom"
             elif self.last_phase == "BOTTOM":
@@ -393,10 +436,7 @@ class IncrementalRepDetector:
                 if self._current_bottom_y is None or y_curr > self._current_bottom_y:
                     self._current_bottom_y = y_curr
                     self._current_bottom_frame = frame_idx
-                    self._current_bottom_metrics = compute_frame_metrics(
-                        keypoints, baseline=self.baseline,
-                        keypoints_3d=keypoints_3d if valid_3d else None,
-                    )
+                    self._current_bottom_metrics = metrics
                 if y_curr < (bottom_thresh - hysteresis):
                     self.last_phase = "ASCENT"
                     self._ascent_start_frame = frame_idx
@@ -27,10 +27,16 @@ def median_filter(values: np.ndarray, window: int) -> np.ndarray:
     if window < 3 or window % 2 == 0:
         return values
     half = window // 2
-    out = values.copy()
-    n = len(values)
-    for i in range(n):
-        lo = max(0, i - half)
-        hi = min(n, i + half + 1)
-        out[i] = np.nanmedian(values[lo:hi])
+    if len(values) == 0:
+        return values.copy()
+    # Pad with NaN so edge windows shrink to the samples in range, as a
+    # truncated slice would.  Sorting puts NaN last, so each window's median
+    # sits in the middle of its leading finite run.
+    padded = np.pad(np.asarray(values, dtype=float), half, constant_values=np.nan)
+    windows = np.sort(np.lib.stride_tricks.sliding_window_view(padded, window), axis=1)
+    counts = np.count_nonzero(~np.isnan(windows), axis=1)
+    rows = np.arange(len(windows))
+    lo = np.maximum(counts - 1, 0) // 2
+    out = (windows[rows, lo] + windows[rows, counts // 2]) / 2.0
+    out[counts == 0] = np.nan
     return out
@@ -6,12 +6,13 @@ import os
 import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.config import settings
 from backend.db.engine import init_db
@@ -42,6 +43,16 @@ logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 from backend.rate_limit import limiter  # noqa: E402
 
 
+# ── Health check bodies ────────────────────────────────────────────────
+# Load balancers poll /health constantly and the body only ever takes one
+# of two values, so the JSON is encoded once here.  A fresh Response is
+# still built per request: middleware (CORS) appends to a response's raw
+# header list in place, so sharing one Response object is unsafe.
+_HEALTH_OK_BODY = b'{"status":"ok","database":"connected"}'
+_HEALTH_DEGRADED_BODY = b'{"status":"degraded","database":"unreachable"}'
+_HEALTH_HEADERS = {"Cache-Control": "no-store"}
+
+
 # ── Request logging middleware ────────────────────────────────────────────
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Log every HTTP request with method, path, status, and duration."""
@@ -69,6 +80,56 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 
+# ── Upload size guard ─────────────────────────────────────────────────────
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads to *path* from their Content-Length header.
+
+    FastAPI reads (and spools to disk) a whole multipart body before the
+    handler's own size check can run, so an oversized video would otherwise
+    be received in full just to be refused.  This answers 413 before any of
+    the body is read.  Uploads without a declared length still fall through
+    to the handler's streaming check.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, max_bytes: int) -> None:
+        self.app = app
+        self.path = path.rstrip("/")
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"].rstrip("/") == self.path
+        ):
+            length = _declared_content_length(scope)
+            if length is not None and length > self.max_bytes:
+                logger.info(
+                    "Rejecting %d-byte upload to %s before reading it", length, scope["path"],
+                )
+                response = JSONResponse(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    content={
+                        "detail": f"File too large. Maximum size is "
+                        f"{self.max_bytes // (1024 * 1024)} MB.",
+                    },
+                    headers={"Connection": "close"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def _declared_content_length(scope: Scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Run DB init on startup."""
@@ -78,6 +139,9 @@ async def lifespan(app: FastAPI):
     yield
     logger.info("Shutting down FreeForm Fitness backend")
 
+    from backend.ai.coach import close_http_client
+    close_http_client()
+
     # Wait for in-flight analysis threads to finish (up to 10s)
     from backend.routers.analysis import _active_threads, _active_threads_lock
     with _active_threads_lock:
@@ -101,6 +165,16 @@ def create_app() -> FastAPI:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+    api_prefix = "/api/v1"
+
+    # Oversized video uploads are refused from their headers alone
+    from backend.routers.analysis import _MAX_UPLOAD_REQUEST_BYTES, router as analysis_router
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        path=f"{api_prefix}{analysis_router.prefix}/",
+        max_bytes=_MAX_UPLOAD_REQUEST_BYTES,
+    )
+
     # Request logging (added first so it wraps everything)
     app.add_middleware(RequestLoggingMiddleware)
 
@@ -128,7 +202,6 @@ def create_app() -> FastAPI:
         waitlist,
     )
 
-    api_prefix = "/api/v1"
     app.include_router(auth.router, prefix=api_prefix)
     app.include_router(users.router, prefix=api_prefix)
     app.include_router(exercises.router, prefix=api_prefix)
@@ -141,20 +214,26 @@ def create_app() -> FastAPI:
     app.include_router(league_auth.router, prefix=api_prefix)
     app.include_router(league.router, prefix=api_prefix)
 
-    @app.get("/api/v1/health")
-    async def health():
+    @app.get("/api/v1/health", response_class=Response)
+    async def health() -> Response:
         from sqlalchemy import text
         from backend.db.engine import AsyncSessionLocal
 
         try:
             async with AsyncSessionLocal() as session:
                 await session.execute(text("SELECT 1"))
-            return {"status": "ok", "database": "connected"}
+            return Response(
+                content=_HEALTH_OK_BODY,
+                media_type="application/json",
+                headers=_HEALTH_HEADERS,
+            )
         except Exception as exc:
             logger.error("Health check failed: %s", exc)
-            return JSONResponse(
-                status_code=503,
-                content={"status": "degraded", "database": "unreachable"},
+            return Response(
+                content=_HEALTH_DEGRADED_BODY,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                media_type="application/json",
+                headers=_HEALTH_HEADERS,
             )
 
     return app
@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import shutil
+import queue
 import tempfile
 import threading
 import time
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 
 import cv2
 import numpy as np
@@ -46,6 +46,27 @@ _active_threads_lock = threading.Lock()
 
 # Max upload size: 100 MB
 _MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+# Whole multipart request limit: the video plus room for boundaries and the
+# small form fields, checked against Content-Length before the body is read
+_MAX_UPLOAD_REQUEST_BYTES = _MAX_UPLOAD_BYTES + 64 * 1024
+
+# Decoded frames buffered between the video reader thread and pose inference
+_DECODE_QUEUE_SIZE = 8
+# How often a blocked reader re-checks whether the consumer has stopped
+_DECODE_QUEUE_POLL_SEC = 0.1
+# Upper bound for "analyse every Nth frame"; squat trajectories stay smooth
+# well past 4x subsampling at typical 30 fps phone footage
+_MAX_FRAME_STRIDE = 4
+
+# Accepted upload types (a known MIME type *or* a known extension suffices)
+_ALLOWED_MIMES = frozenset({
+    "video/mp4", "video/quicktime", "video/x-msvideo", "video/webm",
+    "video/x-matroska", "video/mpeg", "video/ogg",
+    "application/octet-stream",  # some browsers send this for video
+})
+_ALLOWED_EXTENSIONS = frozenset({".mp4", ".mov", ".avi", ".webm", ".mkv", ".mpeg", ".mpg", ".ogg"})
+# Chunk size for copying the spooled upload into the analysis temp file
+_UPLOAD_COPY_CHUNK_BYTES = 1024 * 1024
 
 
 # ---------------------------------------------------------------------------
@@ -82,15 +103,103 @@ def _update_job_sync(job_id: str, status: str, result: dict | None = None, error
 # Background analysis
 # ---------------------------------------------------------------------------
 
-def _run_analysis(job_id: str, video_path: str, exercise_type: str) -> None:
-    """Run pose estimation, rep detection, and scoring in a background thread."""
+def _put_until_stopped(
+    frames: queue.Queue,
+    item: np.ndarray | None,
+    stop: threading.Event,
+) -> bool:
+    """Put *item* on *frames*, giving up if *stop* is set. Returns True if queued."""
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=_DECODE_QUEUE_POLL_SEC)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _ReaderStats:
+    """What the reader thread reports once it has queued the end marker."""
+
+    def __init__(self) -> None:
+        self.source_frames = 0
+        self.error: BaseException | None = None
+
+
+def _read_frames(
+    cap: cv2.VideoCapture,
+    frames: queue.Queue,
+    stop: threading.Event,
+    stride: int = 1,
+    stats: _ReaderStats | None = None,
+) -> None:
+    """Decode frames from *cap* onto *frames* until EOF; ``None`` marks the end.
+
+    Runs on its own thread so video decode overlaps with pose inference
+    (both release the GIL inside OpenCV / MediaPipe).  Frames are converted
+    to RGB here, in place, so MediaPipe's colour conversion overlaps with
+    inference too.  With ``stride > 1`` only every Nth frame is retrieved;
+    the ones in between are advanced past with ``grab()``, which skips
+    copying them out of the decoder and converting them (the codec still
+    decodes them).
+
+    The end marker is queued even if reading fails.  *stats* receives the
+    number of source frames read and any exception, before the marker, so
+    the consumer can report the count and re-raise the failure.
+    """
+    if stats is None:
+        stats = _ReaderStats()
+    try:
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            stats.source_frames += 1
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+            if not _put_until_stopped(frames, frame, stop):
+                return
+            for _ in range(stride - 1):
+                if not cap.grab():
+                    break
+                stats.source_frames += 1
+    except Exception as exc:
+        logger.warning("Video reader failed: %s", exc)
+        stats.error = exc
+    finally:
+        _put_until_stopped(frames, None, stop)
+
+
+def _iter_frames(frames: queue.Queue, stats: _ReaderStats) -> Iterator[np.ndarray]:
+    """Yield frames queued by :func:`_read_frames`, re-raising its failure."""
+    while True:
+        frame = frames.get()
+        if frame is None:
+            break
+        yield frame
+    if stats.error is not None:
+        raise stats.error
+
+
+def _run_analysis(
+    job_id: str,
+    video_path: str,
+    exercise_type: str,
+    frame_stride: int = 1,
+) -> None:
+    """Run pose estimation, rep detection, and scoring in a background thread.
+
+    *frame_stride* analyses every Nth frame; timing-based metrics use the
+    effective frame rate ``source_fps / frame_stride``.  The result keeps
+    ``fps``/``total_frames`` describing the source video and reports the
+    subsampled rate and count as ``effective_fps``/``analyzed_frames``.
+    """
     try:
         # Lazy import to avoid loading heavy libs at module level
         from backend.core.rep_detector import IncrementalRepDetector
         from backend.core.frame_metrics import compute_frame_metrics
-        from backend.core.smoothing import smooth_keypoints_ema, smooth_keypoints_ema_3d
+        from backend.core.smoothing import ONE_EURO_BETA_3D, OneEuroFilter
 
-        pose = create_pose_detector()
+        pose = create_pose_detector(video_mode=True)
 
         # Look up exercise config — reject unknown types
         try:
@@ -110,46 +219,61 @@ def _run_analysis(job_id: str, video_path: str, exercise_type: str) -> None:
             _update_job_sync(job_id, "failed", error="Could not open video file")
             return
 
-        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        fps = source_fps / frame_stride
         detector = IncrementalRepDetector()
         scorer = CompositeScorer()
         fatigue_engine = FatigueEngine()
 
         frame_idx = 0
-        prev_kp = None
-        prev_kp3 = None
+        smooth_kp = OneEuroFilter()
+        smooth_kp3 = OneEuroFilter(beta=ONE_EURO_BETA_3D)
         session_tempo_values: list[float] = []
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            pose_result = process_frame(frame, pose)
-            keypoints = None
-            keypoints_3d = None
-
-            if pose_result is not None:
-                keypoints = pose_result["keypoints_2d"]
-                keypoints_3d = pose_result.get("keypoints_3d")
-
-                # EMA smoothing
-                keypoints = smooth_keypoints_ema(keypoints, prev_kp)
-                prev_kp = keypoints
-                if keypoints_3d is not None:
-                    keypoints_3d = smooth_keypoints_ema_3d(keypoints_3d, prev_kp3)
-                    prev_kp3 = keypoints_3d
-
-            detector.push(frame_idx, keypoints, fps, keypoints_3d=keypoints_3d)
-            frame_idx += 1
-
-        cap.release()
+        # Producer/consumer: a reader thread decodes ahead into a bounded
+        # queue while this thread runs pose inference and rep detection.
+        frames: queue.Queue = queue.Queue(maxsize=_DECODE_QUEUE_SIZE)
+        stop_reading = threading.Event()
+        reader_stats = _ReaderStats()
+        reader = threading.Thread(
+            target=_read_frames,
+            args=(cap, frames, stop_reading, frame_stride, reader_stats),
+            name=f"analysis_decode_{job_id[:8]}",
+            daemon=True,
+        )
+        reader.start()
+        try:
+            pose_last_ts = -1
+            for frame in _iter_frames(frames, reader_stats):
+                # VIDEO mode rejects non-increasing timestamps, which bogus
+                # fps metadata (> 1000) would otherwise produce after rounding
+                pose_last_ts = max(pose_last_ts + 1, int(frame_idx * 1000.0 / fps))
+                pose_result = process_frame(frame, pose, timestamp_ms=pose_last_ts, is_rgb=True)
+                keypoints = None
+                keypoints_3d = None
+
+                if pose_result is not None:
+                    keypoints = pose_result["keypoints_2d"]
+                    keypoints_3d = pose_result.get("keypoints_3d")
+
+                    # One-euro smoothing
+                    keypoints = smooth_kp(keypoints, 1.0 / fps)
+                    if keypoints_3d is not None:
+                        keypoints_3d = smooth_kp3(keypoints_3d, 1.0 / fps)
+
+                detector.push(frame_idx, keypoints, fps, keypoints_3d=keypoints_3d)
+                frame_idx += 1
+        finally:
+            stop_reading.set()
+            reader.join()
+            cap.release()
 
         # Score each rep
         scored_reps = []
         for rep_data in detector.confirmed_reps:
+            get = rep_data.get
             # Compute tempo avg
-            dur = rep_data.get("duration_sec")
+            dur = get("duration_sec")
             if dur is not None:
                 session_tempo_values.append(dur * 1000.0)
             avg_tempo_ms = (
@@ -160,35 +284,35 @@ def _run_analysis(job_id: str, video_path: str, exercise_type: str) -> None:
 
             # Build metrics dict for scorer
             metrics = {
-                "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                "secondary_angle_deg": rep_data.get("hip_angle_deg"),
-                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                "com_offset_norm": rep_data.get("com_offset_norm"),
-                "speed_proxy": rep_data.get("speed_proxy"),
+                "primary_angle_deg": get("knee_flexion_deg"),
+                "secondary_angle_deg": get("hip_angle_deg"),
+                "trunk_angle_deg": get("trunk_angle_deg"),
+                "com_offset_norm": get("com_offset_norm"),
+                "speed_proxy": get("speed_proxy"),
                 "duration_ms": (dur * 1000.0) if dur else None,
-                "balance_ok_pct": rep_data.get("balance_ok_pct", 0.5),
-                "com_variance": rep_data.get("com_variance", 0.02),
-                "left_primary_angle": rep_data.get("left_knee_flexion_deg"),
-                "right_primary_angle": rep_data.get("right_knee_flexion_deg"),
-                "depth_ok": rep_data.get("depth_ok"),
+                "balance_ok_pct": get("balance_ok_pct", 0.5),
+                "com_variance": get("com_variance", 0.02),
+                "left_primary_angle": get("left_knee_flexion_deg"),
+                "right_primary_angle": get("right_knee_flexion_deg"),
+                "depth_ok": get("depth_ok"),
             }
             scores = scorer.score_rep(metrics, exercise_config, avg_tempo_ms)
 
             scored_rep = {
-                "rep_number": rep_data.get("rep"),
+                "rep_number": get("rep"),
                 "duration_sec": dur,
-                "depth_ok": rep_data.get("depth_ok"),
-                "form_ok": rep_data.get("form_ok"),
-                "balance_ok": rep_data.get("balance_ok"),
-                "trunk_ok": rep_data.get("trunk_ok"),
-                "knee_flexion_deg": rep_data.get("knee_flexion_deg"),
-                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                "com_offset_norm": rep_data.get("com_offset_norm"),
-                "speed_proxy": rep_data.get("speed_proxy"),
-                "pose_confidence": rep_data.get("pose_confidence"),
-                "eccentric_ms": rep_data.get("eccentric_ms"),
-                "pause_ms": rep_data.get("pause_ms"),
-                "concentric_ms": rep_data.get("concentric_ms"),
+                "depth_ok": get("depth_ok"),
+                "form_ok": get("form_ok"),
+                "balance_ok": get("balance_ok"),
+                "trunk_ok": get("trunk_ok"),
+                "knee_flexion_deg": get("knee_flexion_deg"),
+                "trunk_angle_deg": get("trunk_angle_deg"),
+                "com_offset_norm": get("com_offset_norm"),
+                "speed_proxy": get("speed_proxy"),
+                "pose_confidence": get("pose_confidence"),
+                "eccentric_ms": get("eccentric_ms"),
+                "pause_ms": get("pause_ms"),
+                "concentric_ms": get("concentric_ms"),
             }
             scored_rep.update(scores)
             scored_reps.append(scored_rep)
@@ -209,8 +333,11 @@ def _run_analysis(job_id: str, video_path: str, exercise_type: str) -> None:
         result = {
             "exercise_type": exercise_type,
             "total_reps": len(scored_reps),
-            "fps": fps,
-            "total_frames": frame_idx,
+            "fps": source_fps,
+            "total_frames": reader_stats.source_frames,
+            "frame_stride": frame_stride,
+            "effective_fps": fps,
+            "analyzed_frames": frame_idx,
             "avg_form_score": avg_form,
             "fatigue_index": fatigue_result.get("fatigue_index"),
             "fatigue_risk": fatigue_result.get("fatigue_risk"),
@@ -237,6 +364,53 @@ def _run_analysis(job_id: str, video_path: str, exercise_type: str) -> None:
             pass
 
 
+# ---------------------------------------------------------------------------
+# Upload handling
+# ---------------------------------------------------------------------------
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"File too large. Maximum size is {_MAX_UPLOAD_BYTES // (1024*1024)} MB.",
+    )
+
+
+def _copy_upload(src: BinaryIO, dst: BinaryIO) -> None:
+    """Copy *src* to *dst* in chunks, refusing more than ``_MAX_UPLOAD_BYTES``."""
+    copied = 0
+    while chunk := src.read(_UPLOAD_COPY_CHUNK_BYTES):
+        copied += len(chunk)
+        if copied > _MAX_UPLOAD_BYTES:
+            raise _too_large()
+        dst.write(chunk)
+
+
+async def _save_upload(file: UploadFile, suffix: str) -> str:
+    """Copy an uploaded video into a named temp file for OpenCV; return its path.
+
+    The copy runs in a worker thread so a slow disk never stalls the event
+    loop (and every live WebSocket) mid-upload.  The size limit is checked
+    up front from the parsed size and again while copying.
+    """
+    if file.size is not None and file.size > _MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    try:
+        with tmp:
+            await asyncio.to_thread(_copy_upload, file.file, tmp)
+    except HTTPException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    except Exception as exc:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to read uploaded file: {exc}",
+        )
+    return tmp.name
+
+
 # ---------------------------------------------------------------------------
 # POST / -- upload video for analysis
 # ---------------------------------------------------------------------------
@@ -251,6 +425,12 @@ async def upload_video(
     request: Request,
     file: UploadFile = File(..., description="Video file to analyse"),
     exercise_type: str = Form(default="squat", description="Exercise type"),
+    frame_stride: int = Form(
+        default=1,
+        ge=1,
+        le=_MAX_FRAME_STRIDE,
+        description="Analyse every Nth frame (1 = every frame)",
+    ),
 ) -> JSONResponse:
     """Accept a video upload, start background analysis, return a job ID."""
     # Validate exercise type upfront
@@ -265,13 +445,6 @@ async def upload_video(
         )
 
     # Validate MIME type (accept common video formats)
-    _ALLOWED_MIMES = {
-        "video/mp4", "video/quicktime", "video/x-msvideo", "video/webm",
-        "video/x-matroska", "video/mpeg", "video/ogg",
-        "application/octet-stream",  # some browsers send this for video
-    }
-    _ALLOWED_EXTENSIONS = {".mp4", ".mov", ".avi", ".webm", ".mkv", ".mpeg", ".mpg", ".ogg"}
-
     content_type = (file.content_type or "").lower()
     raw_suffix = Path(file.filename or "video.mp4").suffix.lower() or ".mp4"
 
@@ -283,35 +456,7 @@ async def upload_video(
 
     # Sanitize suffix — only allow known video extensions
     suffix = raw_suffix if raw_suffix in _ALLOWED_EXTENSIONS else ".mp4"
-
-    # Save upload to temp file (with size limit)
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    try:
-        total_read = 0
-        while True:
-            chunk = await file.read(1024 * 1024)  # 1 MB chunks
-            if not chunk:
-                break
-            total_read += len(chunk)
-            if total_read > _MAX_UPLOAD_BYTES:
-                tmp.close()
-                Path(tmp.name).unlink(missing_ok=True)
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=f"File too large. Maximum size is {_MAX_UPLOAD_BYTES // (1024*1024)} MB.",
-                )
-            tmp.write(chunk)
-        tmp.flush()
-        tmp.close()
-    except HTTPException:
-        raise
-    except Exception as exc:
-        tmp.close()
-        Path(tmp.name).unlink(missing_ok=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to read uploaded file: {exc}",
-        )
+    video_path = await _save_upload(file, suffix)
 
     job_id = uuid.uuid4().hex
 
@@ -346,16 +491,16 @@ async def upload_video(
         }
 
     # Start background thread (tracked for graceful shutdown)
-    def _tracked_analysis(jid: str, vpath: str, etype: str) -> None:
+    def _tracked_analysis(jid: str, vpath: str, etype: str, stride: int) -> None:
         try:
-            _run_analysis(jid, vpath, etype)
+            _run_analysis(jid, vpath, etype, stride)
         finally:
             with _active_threads_lock:
                 _active_threads.discard(threading.current_thread())
 
     thread = threading.Thread(
         target=_tracked_analysis,
-        args=(job_id, tmp.name, exercise_type),
+        args=(job_id, video_path, exercise_type, frame_stride),
         daemon=True,
     )
     with _active_threads_lock:
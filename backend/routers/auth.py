@@ -7,6 +7,7 @@ import hashlib
 import logging
 import secrets
 from datetime import datetime, timedelta, timezone
+from html import escape
 from uuid import UUID
 
 import bcrypt
@@ -251,6 +252,7 @@ def _create_password_reset_token(user_id: UUID, password_hash: str) -> str:
 
 def _build_reset_html(reset_url: str) -> str:
     """Build the password reset email HTML."""
+    reset_url = escape(reset_url, quote=True)
     return f"""\
     <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 520px; margin: 0 auto; padding: 32px 24px; color: #e4e4e7; background-color: #18181b; border-radius: 16px;">
       <div style="text-align: center; margin-bottom: 24px;">
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 from datetime import datetime
@@ -13,6 +15,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from backend.config import settings
+from backend.db.engine import AsyncSessionLocal
 from backend.deps import get_current_user, get_current_user_id, get_db
 from backend.models.session import Session, Set
 from backend.models.user import User
@@ -22,6 +26,20 @@ logger = logging.getLogger("squatsense.coach")
 
 router = APIRouter(prefix="/coach", tags=["coach"])
 
+# In-flight AI coaching generations keyed by session.  Requests for the same
+# session share one background task (one LLM call), and the map holds the
+# strong reference that keeps the task from being collected.
+_inflight_coaching: dict[UUID, asyncio.Task] = {}
+
+# Per-rep metrics averaged by the static (non-LLM) fallback coaching cues.
+_FALLBACK_AVG_KEYS = (
+    "primary_angle_deg",
+    "trunk_angle_deg",
+    "symmetry_score",
+    "stability_score",
+    "tempo_score",
+)
+
 
 # ---------------------------------------------------------------------------
 # Helpers for coaching history (variety across sessions)
@@ -55,14 +73,10 @@ async def _get_recent_coaching(
 
     coaching_history: list[dict[str, Any]] = []
     for raw in rows:
-        if not raw:
-            continue
-        try:
-            parsed = json.loads(raw) if isinstance(raw, str) else raw
-            if isinstance(parsed, dict) and parsed.get("coaching_cues"):
-                coaching_history.append(parsed)
-        except (json.JSONDecodeError, TypeError):
+        parsed = _parse_stored_coaching(raw)
+        if parsed is None:
             continue
+        coaching_history.append(parsed)
         if len(coaching_history) >= limit:
             break
 
@@ -76,7 +90,7 @@ async def _save_coaching_to_session(
 ) -> None:
     """Persist coaching feedback JSON to the session's ai_coaching field."""
     try:
-        session.ai_coaching = json.dumps(coaching)
+        session.ai_coaching = json.dumps(coaching, separators=(",", ":"))
         db.add(session)
         await db.flush()
         logger.info("Saved coaching to session %s", session.id)
@@ -84,6 +98,61 @@ async def _save_coaching_to_session(
         logger.exception("Failed to save coaching to session %s", session.id)
 
 
+def _parse_stored_coaching(raw: Any) -> dict[str, Any] | None:
+    """Return the session's persisted coaching dict, or None if absent/invalid."""
+    if not raw:
+        return None
+    try:
+        parsed = json.loads(raw) if isinstance(raw, str) else raw
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return parsed if isinstance(parsed, dict) and parsed.get("coaching_cues") else None
+
+
+async def _generate_and_store_coaching(
+    session_id: UUID,
+    feedback_kwargs: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Call the AI coach and persist the result in its own DB session."""
+    coaching = await ai_coach_feedback(**feedback_kwargs)
+    if coaching is None:
+        return None
+    try:
+        async with AsyncSessionLocal() as db:
+            session = await db.get(Session, session_id)
+            if session is not None:
+                await _save_coaching_to_session(db, session, coaching)
+                await db.commit()
+    except Exception:
+        logger.exception("Failed to persist coaching for session %s", session_id)
+    return coaching
+
+
+def _on_coaching_done(session_id: UUID, task: asyncio.Task) -> None:
+    if _inflight_coaching.get(session_id) is task:
+        del _inflight_coaching[session_id]
+    if not task.cancelled() and (exc := task.exception()) is not None:
+        logger.error("Coaching generation for session %s failed", session_id, exc_info=exc)
+
+
+def _schedule_coaching(
+    session_id: UUID,
+    feedback_kwargs: dict[str, Any],
+) -> asyncio.Task:
+    """Start generating coaching for *session_id* in the background.
+
+    Returns the in-flight task when one is already running for the session,
+    so concurrent requests share a single LLM call.  The task persists its
+    result to the session; failures are logged by ``_on_coaching_done``.
+    """
+    task = _inflight_coaching.get(session_id)
+    if task is None:
+        task = asyncio.create_task(_generate_and_store_coaching(session_id, feedback_kwargs))
+        _inflight_coaching[session_id] = task
+        task.add_done_callback(functools.partial(_on_coaching_done, session_id))
+    return task
+
+
 # ---------------------------------------------------------------------------
 # POST /feedback -- AI coaching for a session
 # ---------------------------------------------------------------------------
@@ -176,15 +245,16 @@ async def get_feedback(
         session_id, session.exercise_type, len(reps_data), len(sets_data),
         session.fatigue_index, session.fatigue_risk, session.avg_form_score,
     )
-    for i, rd in enumerate(reps_data):
-        logger.info(
-            "  rep %d input: composite=%s depth=%s stab=%s sym=%s "
-            "tempo=%s rom=%s depth_ok=%s form_ok=%s balance_ok=%s",
-            i + 1, rd.get("composite_score"), rd.get("depth_score"),
-            rd.get("stability_score"), rd.get("symmetry_score"),
-            rd.get("tempo_score"), rd.get("rom_score"),
-            rd.get("depth_ok"), rd.get("form_ok"), rd.get("balance_ok"),
-        )
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, rd in enumerate(reps_data):
+            logger.debug(
+                "  rep %d input: composite=%s depth=%s stab=%s sym=%s "
+                "tempo=%s rom=%s depth_ok=%s form_ok=%s balance_ok=%s",
+                i + 1, rd.get("composite_score"), rd.get("depth_score"),
+                rd.get("stability_score"), rd.get("symmetry_score"),
+                rd.get("tempo_score"), rd.get("rom_score"),
+                rd.get("depth_ok"), rd.get("form_ok"), rd.get("balance_ok"),
+            )
 
     # Fetch recent coaching from past sessions to avoid repetition
     previous_coaching = await _get_recent_coaching(db, user_id, exclude_session_id=session_id, limit=3)
@@ -225,14 +295,32 @@ async def get_feedback(
 
     cues: list[str] = []
 
-    # Analyse rep-level boolean flags and sub-scores
+    # Single pass over the reps: failure counts for the boolean flags plus
+    # running sums/counts for every averaged metric used by the cues below.
     total = len(reps_data)
-    if total > 0:
-        depth_fail = sum(1 for r in reps_data if r.get("depth_ok") is False)
-        trunk_fail = sum(1 for r in reps_data if r.get("trunk_ok") is False)
-        balance_fail = sum(1 for r in reps_data if r.get("balance_ok") is False)
-        form_fail = sum(1 for r in reps_data if r.get("form_ok") is False)
+    depth_fail = trunk_fail = balance_fail = 0
+    metric_sums = dict.fromkeys(_FALLBACK_AVG_KEYS, 0.0)
+    metric_counts = dict.fromkeys(_FALLBACK_AVG_KEYS, 0)
+    for r in reps_data:
+        get = r.get
+        if get("depth_ok") is False:
+            depth_fail += 1
+        if get("trunk_ok") is False:
+            trunk_fail += 1
+        if get("balance_ok") is False:
+            balance_fail += 1
+        for key in _FALLBACK_AVG_KEYS:
+            val = get(key)
+            if val is not None:
+                metric_sums[key] += val
+                metric_counts[key] += 1
+
+    def _avg(key: str) -> float | None:
+        n = metric_counts[key]
+        return metric_sums[key] / n if n else None
 
+    # Analyse rep-level boolean flags and sub-scores
+    if total > 0:
         # Depth cue — actionable coaching based on angle data
         if depth_fail > total * 0.4:
             from backend.core.exercises import ExerciseType, get_exercise_config
@@ -241,9 +329,7 @@ async def get_feedback(
                 ideal_lo = ex_config.ideal_depth_range[0]
             except (ValueError, KeyError):
                 ideal_lo = 95.0
-            angles = [r.get("primary_angle_deg") for r in reps_data
-                       if r.get("primary_angle_deg") is not None]
-            avg_angle = sum(angles) / len(angles) if angles else 0
+            avg_angle = _avg("primary_angle_deg") or 0
             if avg_angle >= ideal_lo:
                 cues.append(
                     f"Depth was flagged in {depth_fail}/{total} reps despite "
@@ -261,9 +347,7 @@ async def get_feedback(
                 )
         # Trunk cue
         if trunk_fail > total * 0.4:
-            trunk_angles = [r.get("trunk_angle_deg") for r in reps_data
-                            if r.get("trunk_angle_deg") is not None]
-            avg_trunk = sum(trunk_angles) / len(trunk_angles) if trunk_angles else 0
+            avg_trunk = _avg("trunk_angle_deg") or 0
             cues.append(
                 f"Excessive forward lean in {trunk_fail}/{total} reps "
                 f"(avg trunk angle {avg_trunk:.0f}°). "
@@ -280,18 +364,16 @@ async def get_feedback(
 
     # Sub-score based cues — actionable coaching
     if total > 0:
-        sym_scores = [r.get("symmetry_score") for r in reps_data if r.get("symmetry_score") is not None]
-        if sym_scores:
-            avg_sym = sum(sym_scores) / len(sym_scores)
+        avg_sym = _avg("symmetry_score")
+        if avg_sym is not None:
             if avg_sym < 50:
                 cues.append(
                     f"Left-right symmetry averaged {avg_sym:.0f}/100. "
                     "Add unilateral work like Bulgarian split squats or single-leg "
                     "Romanian deadlifts (3x8 per side) to address the imbalance."
                 )
-        stab_scores = [r.get("stability_score") for r in reps_data if r.get("stability_score") is not None]
-        if stab_scores:
-            avg_stab = sum(stab_scores) / len(stab_scores)
+        avg_stab = _avg("stability_score")
+        if avg_stab is not None:
             if avg_stab < 60:
                 cues.append(
                     f"Stability averaged {avg_stab:.0f}/100. Slow your tempo to "
@@ -299,9 +381,8 @@ async def get_feedback(
                     "presses (3x10 per side) to strengthen core anti-rotation."
                 )
         # Tempo cue for very inconsistent reps
-        tempo_scores = [r.get("tempo_score") for r in reps_data if r.get("tempo_score") is not None]
-        if tempo_scores:
-            avg_tempo = sum(tempo_scores) / len(tempo_scores)
+        avg_tempo = _avg("tempo_score")
+        if avg_tempo is not None:
             if avg_tempo < 50:
                 cues.append(
                     f"Tempo consistency averaged {avg_tempo:.0f}/100. "
@@ -456,6 +537,9 @@ async def get_latest_feedback(
     """Find the user's most recent session and return coaching data for it.
 
     If no sessions exist, returns a default empty coaching response.
+    ``coaching_status`` is ``"ready"`` when AI coaching is included,
+    ``"pending"`` while it is still being generated (poll again), and
+    ``"unavailable"`` when only the static cues apply.
     """
     user_id = user.id
     user_context = {
@@ -487,6 +571,7 @@ async def get_latest_feedback(
             "cues": [],
             "priority_areas": [],
             "coaching": None,
+            "coaching_status": "unavailable",
         }
 
     session_date = session.created_at
@@ -536,23 +621,31 @@ async def get_latest_feedback(
             "tempo_ok": s.tempo_ok,
         })
 
-    # Fetch recent coaching from past sessions to avoid repetition
-    previous_coaching = await _get_recent_coaching(db, user_id, exclude_session_id=session.id, limit=3)
-
-    # Try AI coach
-    coaching = await ai_coach_feedback(
-        exercise_type=session.exercise_type,
-        reps=reps_data,
-        sets=sets_data,
-        fatigue_index=session.fatigue_index,
-        fatigue_risk=session.fatigue_risk,
-        user_context=user_context,
-        previous_coaching=previous_coaching,
-    )
-
-    # Persist coaching to session for future variety
+    # Serve coaching already generated for this session.  Otherwise start
+    # generating it in the background (one LLM call per session however many
+    # requests poll) and answer now with "pending"; a later poll picks up the
+    # stored result.  Without the AI coach or any reps there is nothing to
+    # wait for, so the static cues below are final ("unavailable").
+    coaching = _parse_stored_coaching(session.ai_coaching)
     if coaching is not None:
-        await _save_coaching_to_session(db, session, coaching)
+        coaching_status = "ready"
+    elif not settings.AI_COACH_ENABLED or not reps_data:
+        coaching_status = "unavailable"
+    else:
+        coaching_status = "pending"
+        if session.id not in _inflight_coaching:
+            previous_coaching = await _get_recent_coaching(
+                db, user_id, exclude_session_id=session.id, limit=3,
+            )
+            _schedule_coaching(session.id, {
+                "exercise_type": session.exercise_type,
+                "reps": reps_data,
+                "sets": sets_data,
+                "fatigue_index": session.fatigue_index,
+                "fatigue_risk": session.fatigue_risk,
+                "user_context": user_context,
+                "previous_coaching": previous_coaching,
+            })
 
     # Build overall assessment and priority areas from session data
     avg_score = session.avg_form_score
@@ -610,6 +703,7 @@ async def get_latest_feedback(
         "cues": cues,
         "priority_areas": priority_areas,
         "coaching": coaching,
+        "coaching_status": coaching_status,
     }
 
 
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import functools
+import gzip
+import hashlib
 import logging
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,6 +28,10 @@ router = APIRouter(prefix="/exercises", tags=["exercises"])
 _recommender = LoadRecommender()
 _programming = ProgrammingEngine()
 
+# The catalogue only changes on deploy: let browsers reuse it briefly and
+# shared caches (CDN) hold it for a day, revalidating via ETag.
+_CATALOGUE_CACHE_CONTROL = "public, max-age=300, s-maxage=86400, stale-while-revalidate=604800"
+
 
 # ---------------------------------------------------------------------------
 # GET / -- list all exercises (no auth required)
@@ -35,9 +42,30 @@ _programming = ProgrammingEngine()
     response_model=ExerciseListResponse,
     summary="List all supported exercises",
 )
-async def list_exercises() -> ExerciseListResponse:
+async def list_exercises(request: Request) -> Response:
     """Return metadata for every registered exercise."""
-    configs = get_all_exercises()
+    gzipped = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = _exercise_list_etag(gzipped)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _CATALOGUE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=_exercise_list_gzip(), media_type="application/json", headers=headers)
+    return Response(content=_exercise_list_json(), media_type="application/json", headers=headers)
+
+
+@functools.lru_cache(maxsize=1)
+def _exercise_list_json() -> bytes:
+    """Serialized exercise catalogue.
+
+    The registry is fixed at import time, so the body is built and encoded
+    once instead of re-validating and re-serializing it on every request.
+    """
     exercises = [
         ExerciseInfo(
             exercise_type=cfg.exercise_type.value,
@@ -46,9 +74,53 @@ async def list_exercises() -> ExerciseListResponse:
             primary_side=cfg.primary_side,
             description=cfg.description,
         )
-        for cfg in configs
+        for cfg in get_all_exercises()
     ]
-    return ExerciseListResponse(exercises=exercises)
+    return ExerciseListResponse(exercises=exercises).model_dump_json().encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def _exercise_list_gzip() -> bytes:
+    """Gzip-compressed exercise catalogue, compressed once at max level."""
+    return gzip.compress(_exercise_list_json(), compresslevel=9, mtime=0)
+
+
+@functools.lru_cache(maxsize=2)
+def _exercise_list_etag(gzipped: bool) -> str:
+    """Strong ETag of the catalogue; each content-coding gets its own tag."""
+    digest = hashlib.sha256(_exercise_list_json()).hexdigest()[:32]
+    return f'"{digest}-gzip"' if gzipped else f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` against ``etag`` (RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if an ``Accept-Encoding`` header allows gzip (``q=0`` refuses)."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding.strip()] = q
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
 
 
 # ---------------------------------------------------------------------------
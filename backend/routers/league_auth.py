@@ -6,6 +6,7 @@ import asyncio
 import hashlib
 import logging
 from datetime import datetime, timedelta, timezone
+from html import escape
 from uuid import UUID
 
 import bcrypt
@@ -326,6 +327,7 @@ def _create_email_verify_token(player_id: UUID) -> str:
 
 def _build_reset_html(reset_url: str) -> str:
     """Build the password reset email HTML."""
+    reset_url = escape(reset_url, quote=True)
     return f"""\
     <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 520px; margin: 0 auto; padding: 32px 24px; color: #e4e4e7; background-color: #18181b; border-radius: 16px;">
       <div style="text-align: center; margin-bottom: 24px;">
@@ -354,6 +356,7 @@ def _build_reset_html(reset_url: str) -> str:
 
 def _build_verify_html(verify_url: str) -> str:
     """Build the email verification HTML."""
+    verify_url = escape(verify_url, quote=True)
     return f"""\
     <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 520px; margin: 0 auto; padding: 32px 24px; color: #e4e4e7; background-color: #18181b; border-radius: 16px;">
       <div style="text-align: center; margin-bottom: 24px;">
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import concurrent.futures
 import json
 import logging
 import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any, Optional
 from uuid import UUID
@@ -28,6 +30,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws/live", tags=["live"])
 
+# Per-frame results are the hottest serialisation path in the backend; use
+# orjson when installed (it also encodes NumPy scalars natively) and fall back
+# to the same compact stdlib encoding Starlette's send_json uses.
+try:
+    import orjson
+
+    def _encode_json(payload: dict[str, Any]) -> str:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+except ImportError:
+    def _encode_json(payload: dict[str, Any]) -> str:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+# OpenCV 4.10+ can decode JPEG straight to RGB, which spares MediaPipe a
+# separate BGR->RGB pass over every frame.
+_DECODE_FLAG = getattr(cv2, "IMREAD_COLOR_RGB", cv2.IMREAD_COLOR)
+_DECODES_RGB = _DECODE_FLAG != cv2.IMREAD_COLOR
+
 # Thread pool for CPU-bound pose estimation so the event loop stays responsive
 _POSE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
     max_workers=2, thread_name_prefix="live_pose"
@@ -105,28 +124,29 @@ async def _save_reps_to_set(
         await db.flush()
 
         for rep_data in scored_reps:
-            dur_sec = rep_data.get("duration_sec")
+            get = rep_data.get
+            dur_sec = get("duration_sec")
             rep = Rep(
                 set_id=target_set.id,
                 session_id=session_id,
-                rep_number=rep_data.get("rep_number", 0),
+                rep_number=get("rep_number", 0),
                 duration_ms=int(dur_sec * 1000) if dur_sec else None,
-                eccentric_ms=rep_data.get("eccentric_ms"),
-                pause_ms=rep_data.get("pause_ms"),
-                concentric_ms=rep_data.get("concentric_ms"),
-                composite_score=rep_data.get("composite_score"),
-                depth_score=rep_data.get("depth_score"),
-                stability_score=rep_data.get("stability_score"),
-                symmetry_score=rep_data.get("symmetry_score"),
-                tempo_score=rep_data.get("tempo_score"),
-                rom_score=rep_data.get("rom_score"),
-                primary_angle_deg=rep_data.get("primary_angle_deg"),
-                trunk_angle_deg=rep_data.get("trunk_angle_deg"),
-                com_offset_norm=rep_data.get("com_offset_norm"),
-                speed_proxy=rep_data.get("speed_proxy"),
-                depth_ok=rep_data.get("depth_ok"),
-                form_ok=rep_data.get("form_ok"),
-                balance_ok=rep_data.get("balance_ok"),
+                eccentric_ms=get("eccentric_ms"),
+                pause_ms=get("pause_ms"),
+                concentric_ms=get("concentric_ms"),
+                composite_score=get("composite_score"),
+                depth_score=get("depth_score"),
+                stability_score=get("stability_score"),
+                symmetry_score=get("symmetry_score"),
+                tempo_score=get("tempo_score"),
+                rom_score=get("rom_score"),
+                primary_angle_deg=get("primary_angle_deg"),
+                trunk_angle_deg=get("trunk_angle_deg"),
+                com_offset_norm=get("com_offset_norm"),
+                speed_proxy=get("speed_proxy"),
+                depth_ok=get("depth_ok"),
+                form_ok=get("form_ok"),
+                balance_ok=get("balance_ok"),
                 timestamp=datetime.now(timezone.utc),
             )
             db.add(rep)
@@ -134,32 +154,68 @@ async def _save_reps_to_set(
         await db.commit()
 
 
+def _landmarks_to_arrays(
+    norm_lms: list,
+    world_lms: Optional[list],
+    width: float,
+    height: float,
+) -> Optional[tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Convert client landmark lists into pixel ``(K, 2)`` and world ``(K, 3)`` arrays.
+
+    Each list is converted in one NumPy call rather than per point.  Returns
+    None when the 2D landmarks are malformed; malformed world landmarks just
+    disable the 3D path for the frame.
+    """
+    try:
+        arr = np.asarray(norm_lms, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if arr.ndim != 2 or arr.shape[1] < 2:
+        return None
+    # Normalized (0-1) to pixel coords
+    keypoints = arr[:, :2] * (width, height)
+
+    keypoints_3d = None
+    if world_lms and len(world_lms) >= 33:
+        try:
+            world = np.asarray(world_lms, dtype=np.float64)
+        except (TypeError, ValueError):
+            world = None
+        if world is not None and world.ndim == 2 and world.shape[1] >= 3:
+            keypoints_3d = world[:, :3]
+    return keypoints, keypoints_3d
+
+
 def _decode_frame(data: bytes) -> Optional[np.ndarray]:
-    """Decode a JPEG frame from raw bytes or base64-encoded string."""
+    """Decode a JPEG frame from raw bytes or base64-encoded string.
+
+    Frames come back in RGB channel order when ``_DECODES_RGB`` is set.
+    """
     if not data:
         return None
 
     # Try raw JPEG bytes first
     try:
         arr = np.frombuffer(data, dtype=np.uint8)
-        frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+        frame = cv2.imdecode(arr, _DECODE_FLAG)
         if frame is not None:
             return frame
     except Exception:
         pass
 
-    # Try base64 decoding
+    # Try base64 decoding, slicing the payload through a memoryview instead
+    # of copying the whole frame into a str and again when splitting it
     try:
-        if isinstance(data, bytes):
-            data_str = data.decode("utf-8", errors="ignore")
-        else:
-            data_str = data
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        payload = memoryview(data)
         # Strip data URI prefix if present
-        if "," in data_str:
-            data_str = data_str.split(",", 1)[1]
-        raw = base64.b64decode(data_str)
+        comma = data.find(b",")
+        if comma != -1:
+            payload = payload[comma + 1:]
+        raw = base64.b64decode(payload)
         arr = np.frombuffer(raw, dtype=np.uint8)
-        frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+        frame = cv2.imdecode(arr, _DECODE_FLAG)
         return frame
     except Exception:
         return None
@@ -168,9 +224,204 @@ def _decode_frame(data: bytes) -> Optional[np.ndarray]:
 def _process_frame_sync(
     frame: np.ndarray,
     pose: Any,
+    timestamp_ms: Optional[int] = None,
 ) -> Optional[dict]:
     """Run pose estimation synchronously (for thread pool)."""
-    return process_frame(frame, pose)
+    return process_frame(frame, pose, timestamp_ms=timestamp_ms, is_rgb=_DECODES_RGB)
+
+
+def _decode_and_process_sync(
+    data: bytes,
+    pose: Any,
+    timestamp_ms: Optional[int] = None,
+) -> tuple[bool, Optional[dict]]:
+    """Decode a JPEG frame and run pose estimation on it (for thread pool).
+
+    Decoding happens in the worker too, so base64/JPEG decode never blocks
+    the event loop.  Returns ``(decoded, pose_result)``.
+    """
+    frame = _decode_frame(data)
+    if frame is None:
+        return False, None
+    return True, _process_frame_sync(frame, pose, timestamp_ms)
+
+
+# ---------------------------------------------------------------------------
+# Per-rep row templates
+# ---------------------------------------------------------------------------
+
+# (output_key, rep_data_key) pairs, resolved once at import time so each rep
+# row is built from a table walk instead of a hand-written dict literal.
+_SCORER_INPUT_FIELDS: tuple[tuple[str, str], ...] = (
+    ("primary_angle_deg", "knee_flexion_deg"),
+    ("trunk_angle_deg", "trunk_angle_deg"),
+    ("com_offset_norm", "com_offset_norm"),
+    ("speed_proxy", "speed_proxy"),
+    ("left_primary_angle", "left_knee_flexion_deg"),
+    ("right_primary_angle", "right_knee_flexion_deg"),
+    ("depth_ok", "depth_ok"),
+)
+_SCORED_REP_FIELDS: tuple[tuple[str, str], ...] = (
+    ("duration_sec", "duration_sec"),
+    ("depth_ok", "depth_ok"),
+    ("form_ok", "form_ok"),
+    ("balance_ok", "balance_ok"),
+    ("primary_angle_deg", "knee_flexion_deg"),
+    ("trunk_angle_deg", "trunk_angle_deg"),
+    ("com_offset_norm", "com_offset_norm"),
+    ("speed_proxy", "speed_proxy"),
+    ("eccentric_ms", "eccentric_ms"),
+    ("pause_ms", "pause_ms"),
+    ("concentric_ms", "concentric_ms"),
+)
+
+
+def _scorer_input(rep_data: dict[str, Any]) -> dict[str, Any]:
+    """Build the CompositeScorer metrics dict for one confirmed rep."""
+    get = rep_data.get
+    dur = get("duration_sec")
+    metrics = {out: get(src) for out, src in _SCORER_INPUT_FIELDS}
+    metrics["duration_ms"] = (dur * 1000.0) if dur else None
+    metrics["balance_ok_pct"] = get("balance_ok_pct", 0.5)
+    metrics["com_variance"] = get("com_variance", 0.02)
+    return metrics
+
+
+def _scored_rep_row(
+    rep_data: dict[str, Any],
+    rep_number: Any,
+    scores: dict[str, Any],
+) -> dict[str, Any]:
+    """Build the scored-rep dict sent to the client and persisted to the DB."""
+    get = rep_data.get
+    row = {"rep_number": rep_number}
+    for out, src in _SCORED_REP_FIELDS:
+        row[out] = get(src)
+    row.update(scores)
+    return row
+
+
+def _score_reps(
+    reps: list[dict[str, Any]],
+    scorer: CompositeScorer,
+    exercise_config: Any,
+    fatigue_engine: FatigueEngine,
+    tempo_values: Optional[list[float]] = None,
+    per_set_numbering: bool = True,
+    log_label: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any], Optional[float]]:
+    """Score a run of confirmed reps and summarise them.
+
+    Each rep's tempo is scored against the running average of the durations
+    seen so far; *tempo_values* is appended to in place, so callers can carry
+    a session-wide history across calls.  With *per_set_numbering* reps are
+    numbered from 1, otherwise the detector's own rep number is kept.
+
+    Returns ``(scored_reps, fatigue_result, avg_form_score)``.
+    """
+    if tempo_values is None:
+        tempo_values = []
+    log_reps = log_label is not None and logger.isEnabledFor(logging.DEBUG)
+
+    scored: list[dict[str, Any]] = []
+    for rep_idx, rep_data in enumerate(reps):
+        dur = rep_data.get("duration_sec")
+        if dur is not None:
+            tempo_values.append(dur * 1000.0)
+        avg_tempo_ms = sum(tempo_values) / len(tempo_values) if tempo_values else None
+        mfs = _scorer_input(rep_data)
+        scores = scorer.score_rep(mfs, exercise_config, avg_tempo_ms)
+        if log_reps:
+            logger.debug(
+                "%s scoring rep %s: mfs=%s → scores=%s",
+                log_label, rep_data.get("rep"), mfs, scores,
+            )
+        rep_number = rep_idx + 1 if per_set_numbering else rep_data.get("rep")
+        scored.append(_scored_rep_row(rep_data, rep_number, scores))
+
+    fatigue_result = fatigue_engine.compute_set_fatigue(scored)
+    composites = [
+        r["composite_score"] for r in scored
+        if r.get("composite_score") is not None
+    ]
+    avg_form = round(sum(composites) / len(composites), 1) if composites else None
+    return scored, fatigue_result, avg_form
+
+
+# ---------------------------------------------------------------------------
+# Inbound message pump
+# ---------------------------------------------------------------------------
+
+class _FrameInbox:
+    """Client messages awaiting processing, with stale JPEG frames coalesced.
+
+    Text messages (commands, client-side landmarks) are kept in arrival
+    order.  A binary frame that arrives while the previous binary frame is
+    still waiting replaces it, so when pose estimation falls behind the
+    pipeline jumps to the newest frame instead of working through a backlog.
+    """
+
+    def __init__(self) -> None:
+        self._items: deque[dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self.dropped_frames = 0
+
+    def put(self, raw: dict[str, Any]) -> None:
+        items = self._items
+        if (
+            raw.get("bytes") is not None
+            and items
+            and items[-1].get("bytes") is not None
+        ):
+            items[-1] = raw
+            self.dropped_frames += 1
+        else:
+            items.append(raw)
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+
+class _FrameThrottle:
+    """Admit frames on a fixed schedule of at most one per *interval* seconds.
+
+    The next slot is one interval after the previous slot, not after the
+    previous frame, so the rate holds at the cap whatever the client's
+    cadence.  After a stall the schedule restarts from the current time
+    instead of admitting a burst to catch up.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next_due = 0.0
+
+    def admit(self, now: float) -> bool:
+        if now < self._next_due:
+            return False
+        if now - self._next_due >= self.interval:
+            self._next_due = now  # stalled: restart the schedule from now
+        self._next_due += self.interval
+        return True
+
+
+async def _pump_messages(websocket: WebSocket, inbox: _FrameInbox) -> None:
+    """Receive from *websocket* into *inbox* until the client disconnects.
+
+    Runs as its own task so the socket is drained while a frame is being
+    processed; any receive failure is surfaced as a disconnect message.
+    """
+    try:
+        while True:
+            raw = await websocket.receive()
+            inbox.put(raw)
+            if raw.get("type") == "websocket.disconnect":
+                return
+    except Exception:
+        inbox.put({"type": "websocket.disconnect"})
 
 
 # ---------------------------------------------------------------------------
@@ -206,6 +457,8 @@ async def live_analysis(
         },
         "status": str,
         "phase": str,
+        "server_fps": float,
+        "dropped_frames": int,  // frames skipped because pose fell behind
       }
 
     On "stop" command, sends final session summary.
@@ -218,7 +471,7 @@ async def live_analysis(
 
     # Lazy imports to avoid loading heavy libs if unused
     from backend.core.rep_detector import IncrementalRepDetector
-    from backend.core.smoothing import smooth_keypoints_ema, smooth_keypoints_ema_3d
+    from backend.core.smoothing import ONE_EURO_BETA_3D, OneEuroFilter
 
     # Look up exercise config — reject unknown types
     try:
@@ -234,16 +487,18 @@ async def live_analysis(
         return
 
     pose = None  # lazy-init: only created when JPEG frames arrive (not needed for landmarks mode)
+    # The server-side detector runs in tracking (VIDEO) mode, which needs
+    # strictly increasing timestamps measured from when it was created.
+    pose_t0 = 0.0
+    pose_last_ts = -1
     detector = IncrementalRepDetector()
     scorer = CompositeScorer()
     fatigue_engine = FatigueEngine()
     load_recommender = LoadRecommender()
 
-    import asyncio
-
     frame_idx = 0
-    prev_kp: Optional[list] = None
-    prev_kp3: Optional[list] = None
+    smooth_kp = OneEuroFilter()
+    smooth_kp3 = OneEuroFilter(beta=ONE_EURO_BETA_3D)
     session_tempo_values: list[float] = []
     fps = 15.0  # estimated; client can adjust
     last_rep_count = 0
@@ -259,19 +514,26 @@ async def live_analysis(
     # Frame throttling: process at most ~10 fps to keep the event loop
     # responsive for HTTP requests running on the same server.
     MIN_FRAME_INTERVAL = 0.08  # seconds (~12 fps max processing rate)
+    throttle = _FrameThrottle(MIN_FRAME_INTERVAL)
     last_frame_time = 0.0
 
     # Cached fatigue result — only recomputed when rep count changes.
     cached_fatigue: dict[str, Any] = {"fatigue_index": 0.0, "fatigue_risk": "low"}
     fatigue_rep_count = 0
 
+    inbox = _FrameInbox()
+    pump = asyncio.create_task(_pump_messages(websocket, inbox))
+
     try:
         while True:
-            raw = await websocket.receive()
+            raw = await inbox.get()
 
             # Handle client disconnect gracefully
             if raw.get("type") == "websocket.disconnect":
-                logger.info("WebSocket client disconnected (session_id=%s)", session_id)
+                logger.info(
+                    "WebSocket client disconnected (session_id=%s, dropped_frames=%d)",
+                    session_id, inbox.dropped_frames,
+                )
                 return
 
             # Handle text messages (commands)
@@ -315,60 +577,14 @@ async def live_analysis(
                         len(detector.confirmed_reps), len(current_reps), session_id,
                     )
                     if session_id and current_reps:
-                        set_scored = []
-                        set_tempos: list[float] = []
-                        for rep_idx, rep_data in enumerate(current_reps):
-                            dur = rep_data.get("duration_sec")
-                            if dur is not None:
-                                set_tempos.append(dur * 1000.0)
-                            avg_t = sum(set_tempos) / len(set_tempos) if set_tempos else None
-                            mfs = {
-                                "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                                "com_offset_norm": rep_data.get("com_offset_norm"),
-                                "speed_proxy": rep_data.get("speed_proxy"),
-                                "duration_ms": (dur * 1000.0) if dur else None,
-                                "balance_ok_pct": rep_data.get("balance_ok_pct", 0.5),
-                                "com_variance": rep_data.get("com_variance", 0.02),
-                                "left_primary_angle": rep_data.get("left_knee_flexion_deg"),
-                                "right_primary_angle": rep_data.get("right_knee_flexion_deg"),
-                                "depth_ok": rep_data.get("depth_ok"),
-                            }
-                            scores = scorer.score_rep(mfs, exercise_config, avg_t)
-                            logger.info(
-                                "end_set scoring rep %s: mfs=%s → scores=%s",
-                                rep_data.get("rep"), mfs, scores,
-                            )
-                            sr = {
-                                "rep_number": rep_idx + 1,  # per-set numbering (1-based)
-                                "duration_sec": dur,
-                                "depth_ok": rep_data.get("depth_ok"),
-                                "form_ok": rep_data.get("form_ok"),
-                                "balance_ok": rep_data.get("balance_ok"),
-                                "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                                "com_offset_norm": rep_data.get("com_offset_norm"),
-                                "speed_proxy": rep_data.get("speed_proxy"),
-                                "eccentric_ms": rep_data.get("eccentric_ms"),
-                                "pause_ms": rep_data.get("pause_ms"),
-                                "concentric_ms": rep_data.get("concentric_ms"),
-                            }
-                            sr.update(scores)
-                            set_scored.append(sr)
-
-                        set_fatigue = fatigue_engine.compute_set_fatigue(set_scored)
-                        set_composites = [
-                            r["composite_score"] for r in set_scored
-                            if r.get("composite_score") is not None
-                        ]
-                        set_avg = (
-                            round(sum(set_composites) / len(set_composites), 1)
-                            if set_composites else None
+                        set_scored, set_fatigue, set_avg = _score_reps(
+                            current_reps, scorer, exercise_config, fatigue_engine,
+                            log_label="end_set",
                         )
                         logger.info(
-                            "end_set set %d summary: scored_reps=%d, composites=%s, "
+                            "end_set set %d summary: scored_reps=%d, "
                             "avg_form=%.1f, fatigue=%s",
-                            current_set_number, len(set_scored), set_composites,
+                            current_set_number, len(set_scored),
                             set_avg or 0.0, set_fatigue,
                         )
 
@@ -442,55 +658,9 @@ async def live_analysis(
                         logger.info("stop: skipping flush (phase=%s)", detector.last_phase)
 
                     # Compute final session summary using ALL reps
-                    scored_reps = []
-                    for rep_data in detector.confirmed_reps:
-                        dur = rep_data.get("duration_sec")
-                        if dur is not None:
-                            session_tempo_values.append(dur * 1000.0)
-                        avg_tempo_ms = (
-                            sum(session_tempo_values) / len(session_tempo_values)
-                            if session_tempo_values
-                            else None
-                        )
-                        metrics_for_score = {
-                            "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                            "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                            "com_offset_norm": rep_data.get("com_offset_norm"),
-                            "speed_proxy": rep_data.get("speed_proxy"),
-                            "duration_ms": (dur * 1000.0) if dur else None,
-                            "balance_ok_pct": rep_data.get("balance_ok_pct", 0.5),
-                            "com_variance": rep_data.get("com_variance", 0.02),
-                            "left_primary_angle": rep_data.get("left_knee_flexion_deg"),
-                            "right_primary_angle": rep_data.get("right_knee_flexion_deg"),
-                            "depth_ok": rep_data.get("depth_ok"),
-                        }
-                        scores = scorer.score_rep(metrics_for_score, exercise_config, avg_tempo_ms)
-                        scored_rep = {
-                            "rep_number": rep_data.get("rep"),
-                            "duration_sec": dur,
-                            "depth_ok": rep_data.get("depth_ok"),
-                            "form_ok": rep_data.get("form_ok"),
-                            "balance_ok": rep_data.get("balance_ok"),
-                            "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                            "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                            "com_offset_norm": rep_data.get("com_offset_norm"),
-                            "speed_proxy": rep_data.get("speed_proxy"),
-                            "eccentric_ms": rep_data.get("eccentric_ms"),
-                            "pause_ms": rep_data.get("pause_ms"),
-                            "concentric_ms": rep_data.get("concentric_ms"),
-                        }
-                        scored_rep.update(scores)
-                        scored_reps.append(scored_rep)
-
-                    fatigue_result = fatigue_engine.compute_set_fatigue(scored_reps)
-                    composite_scores = [
-                        r["composite_score"] for r in scored_reps
-                        if r.get("composite_score") is not None
-                    ]
-                    avg_form = (
-                        round(sum(composite_scores) / len(composite_scores), 1)
-                        if composite_scores
-                        else None
+                    scored_reps, fatigue_result, avg_form = _score_reps(
+                        detector.confirmed_reps, scorer, exercise_config, fatigue_engine,
+                        tempo_values=session_tempo_values, per_set_numbering=False,
                     )
 
                     # ── Persist any unsaved reps (last set) to DB ────────
@@ -507,51 +677,8 @@ async def live_analysis(
                         unsaved_reps = []
                     if session_id and unsaved_reps:
                         # Score and save just the unsaved reps from the last set
-                        last_set_scored = []
-                        last_tempos: list[float] = []
-                        for rep_idx, rep_data in enumerate(unsaved_reps):
-                            dur = rep_data.get("duration_sec")
-                            if dur is not None:
-                                last_tempos.append(dur * 1000.0)
-                            avg_t = sum(last_tempos) / len(last_tempos) if last_tempos else None
-                            mfs = {
-                                "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                                "com_offset_norm": rep_data.get("com_offset_norm"),
-                                "speed_proxy": rep_data.get("speed_proxy"),
-                                "duration_ms": (dur * 1000.0) if dur else None,
-                                "balance_ok_pct": rep_data.get("balance_ok_pct", 0.5),
-                                "com_variance": rep_data.get("com_variance", 0.02),
-                                "left_primary_angle": rep_data.get("left_knee_flexion_deg"),
-                                "right_primary_angle": rep_data.get("right_knee_flexion_deg"),
-                                "depth_ok": rep_data.get("depth_ok"),
-                            }
-                            scores = scorer.score_rep(mfs, exercise_config, avg_t)
-                            sr = {
-                                "rep_number": rep_idx + 1,  # per-set numbering (1-based)
-                                "duration_sec": dur,
-                                "depth_ok": rep_data.get("depth_ok"),
-                                "form_ok": rep_data.get("form_ok"),
-                                "balance_ok": rep_data.get("balance_ok"),
-                                "primary_angle_deg": rep_data.get("knee_flexion_deg"),
-                                "trunk_angle_deg": rep_data.get("trunk_angle_deg"),
-                                "com_offset_norm": rep_data.get("com_offset_norm"),
-                                "speed_proxy": rep_data.get("speed_proxy"),
-                                "eccentric_ms": rep_data.get("eccentric_ms"),
-                                "pause_ms": rep_data.get("pause_ms"),
-                                "concentric_ms": rep_data.get("concentric_ms"),
-                            }
-                            sr.update(scores)
-                            last_set_scored.append(sr)
-
-                        last_fatigue = fatigue_engine.compute_set_fatigue(last_set_scored)
-                        last_composites = [
-                            r["composite_score"] for r in last_set_scored
-                            if r.get("composite_score") is not None
-                        ]
-                        last_avg = (
-                            round(sum(last_composites) / len(last_composites), 1)
-                            if last_composites else None
+                        last_set_scored, last_fatigue, last_avg = _score_reps(
+                            unsaved_reps, scorer, exercise_config, fatigue_engine,
                         )
 
                         try:
@@ -584,23 +711,24 @@ async def live_analysis(
                         fatigue_result.get("fatigue_index", 0),
                         fatigue_result.get("fatigue_risk", "low"),
                     )
-                    for i, sr in enumerate(scored_reps):
-                        logger.info(
-                            "  rep %d: composite=%.1f depth=%.1f stab=%.1f "
-                            "sym=%.1f tempo=%.1f rom=%.1f | "
-                            "angle=%.1f trunk=%.1f depth_ok=%s form_ok=%s",
-                            i + 1,
-                            sr.get("composite_score", 0),
-                            sr.get("depth_score", 0),
-                            sr.get("stability_score", 0),
-                            sr.get("symmetry_score", 0),
-                            sr.get("tempo_score", 0),
-                            sr.get("rom_score", 0),
-                            sr.get("primary_angle_deg") or 0,
-                            sr.get("trunk_angle_deg") or 0,
-                            sr.get("depth_ok"),
-                            sr.get("form_ok"),
-                        )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for i, sr in enumerate(scored_reps):
+                            logger.debug(
+                                "  rep %d: composite=%.1f depth=%.1f stab=%.1f "
+                                "sym=%.1f tempo=%.1f rom=%.1f | "
+                                "angle=%.1f trunk=%.1f depth_ok=%s form_ok=%s",
+                                i + 1,
+                                sr.get("composite_score", 0),
+                                sr.get("depth_score", 0),
+                                sr.get("stability_score", 0),
+                                sr.get("symmetry_score", 0),
+                                sr.get("tempo_score", 0),
+                                sr.get("rom_score", 0),
+                                sr.get("primary_angle_deg") or 0,
+                                sr.get("trunk_angle_deg") or 0,
+                                sr.get("depth_ok"),
+                                sr.get("form_ok"),
+                            )
                     await websocket.send_json(summary)
                     await websocket.close()
                     return
@@ -631,7 +759,7 @@ async def live_analysis(
                 # (msg was already parsed above in the command handler)
                 msg = json.loads(raw["text"])
                 now = time.monotonic()
-                if now - last_frame_time < MIN_FRAME_INTERVAL:
+                if not throttle.admit(now):
                     await asyncio.sleep(0)
                     continue
 
@@ -653,25 +781,18 @@ async def live_analysis(
                     await websocket.send_json({"error": "Invalid landmarks"})
                     continue
 
-                # Convert normalized (0-1) to pixel coords for 2D
-                keypoints = [
-                    (lm[0] * lm_width, lm[1] * lm_height) for lm in norm_lms
-                ]
-                # Convert world landmarks to 3D tuples
-                keypoints_3d = (
-                    [(lm[0], lm[1], lm[2]) for lm in world_lms]
-                    if world_lms and len(world_lms) >= 33
-                    else None
-                )
+                converted = _landmarks_to_arrays(norm_lms, world_lms, lm_width, lm_height)
+                if converted is None:
+                    await websocket.send_json({"error": "Invalid landmarks"})
+                    continue
+                keypoints, keypoints_3d = converted
 
-                # EMA smoothing
-                keypoints = smooth_keypoints_ema(keypoints, prev_kp)
-                prev_kp = keypoints
+                # One-euro smoothing
+                keypoints = smooth_kp(keypoints, 1.0 / fps)
                 if keypoints_3d is not None:
-                    keypoints_3d = smooth_keypoints_ema_3d(keypoints_3d, prev_kp3)
-                    prev_kp3 = keypoints_3d
+                    keypoints_3d = smooth_kp3(keypoints_3d, 1.0 / fps)
 
-                landmarks_out = [[round(x, 1), round(y, 1)] for x, y in keypoints]
+                landmarks_out = np.round(keypoints, 1).tolist()
 
                 # Yield to event loop (landmarks are cheap but keep loop responsive)
                 await asyncio.sleep(0)
@@ -683,9 +804,8 @@ async def live_analysis(
                 if data is None:
                     continue
 
-                # Frame throttling
                 now = time.monotonic()
-                if now - last_frame_time < MIN_FRAME_INTERVAL:
+                if not throttle.admit(now):
                     await asyncio.sleep(0)
                     continue
 
@@ -697,20 +817,20 @@ async def live_analysis(
                         fps = 0.7 * fps + 0.3 * measured_fps
                 last_frame_time = now
 
-                frame = _decode_frame(data)
-                if frame is None:
-                    await websocket.send_json({"error": "Could not decode frame"})
-                    continue
-
                 # Lazy-init pose detector on first JPEG frame
                 if pose is None:
-                    pose = create_pose_detector()
+                    pose = create_pose_detector(video_mode=True)
+                    pose_t0 = now
+                pose_last_ts = max(pose_last_ts + 1, int((now - pose_t0) * 1000))
 
-                # Run pose estimation in thread pool
+                # Decode and run pose estimation in the thread pool
                 loop = asyncio.get_event_loop()
-                pose_result = await loop.run_in_executor(
-                    _POSE_EXECUTOR, _process_frame_sync, frame, pose
+                decoded, pose_result = await loop.run_in_executor(
+                    _POSE_EXECUTOR, _decode_and_process_sync, data, pose, pose_last_ts,
                 )
+                if not decoded:
+                    await websocket.send_json({"error": "Could not decode frame"})
+                    continue
 
                 # Yield to event loop so pending HTTP requests get a chance
                 await asyncio.sleep(0)
@@ -719,14 +839,12 @@ async def live_analysis(
                     keypoints = pose_result["keypoints_2d"]
                     keypoints_3d = pose_result.get("keypoints_3d")
 
-                    # EMA smoothing
-                    keypoints = smooth_keypoints_ema(keypoints, prev_kp)
-                    prev_kp = keypoints
+                    # One-euro smoothing
+                    keypoints = smooth_kp(keypoints, 1.0 / fps)
                     if keypoints_3d is not None:
-                        keypoints_3d = smooth_keypoints_ema_3d(keypoints_3d, prev_kp3)
-                        prev_kp3 = keypoints_3d
+                        keypoints_3d = smooth_kp3(keypoints_3d, 1.0 / fps)
 
-                    landmarks_out = [[round(x, 1), round(y, 1)] for x, y in keypoints]
+                    landmarks_out = np.round(keypoints, 1).tolist()
 
             # ── Shared pipeline: rep detection + scoring + response ──
             # Push to rep detector
@@ -775,19 +893,7 @@ async def live_analysis(
                     if session_tempo_values
                     else None
                 )
-                metrics_for_score = {
-                    "primary_angle_deg": latest_rep.get("knee_flexion_deg"),
-                    "trunk_angle_deg": latest_rep.get("trunk_angle_deg"),
-                    "com_offset_norm": latest_rep.get("com_offset_norm"),
-                    "speed_proxy": latest_rep.get("speed_proxy"),
-                    "duration_ms": (dur * 1000.0) if dur else None,
-                    "balance_ok_pct": latest_rep.get("balance_ok_pct", 0.5),
-                    "com_variance": latest_rep.get("com_variance", 0.02),
-                    "left_primary_angle": latest_rep.get("left_knee_flexion_deg"),
-                    "right_primary_angle": latest_rep.get("right_knee_flexion_deg"),
-                    "depth_ok": latest_rep.get("depth_ok"),
-                }
-                scores = scorer.score_rep(metrics_for_score, exercise_config, avg_tempo_ms)
+                scores = scorer.score_rep(_scorer_input(latest_rep), exercise_config, avg_tempo_ms)
                 current_form_score = scores.get("composite_score")
                 rep_metrics = scores
                 logger.info(
@@ -810,16 +916,7 @@ async def live_analysis(
                     avg_t = (
                         sum(temp_tempos) / len(temp_tempos) if temp_tempos else None
                     )
-                    mfs = {
-                        "primary_angle_deg": rd.get("knee_flexion_deg"),
-                        "speed_proxy": rd.get("speed_proxy"),
-                        "balance_ok_pct": rd.get("balance_ok_pct", 0.5),
-                        "com_variance": rd.get("com_variance", 0.02),
-                        "left_primary_angle": rd.get("left_knee_flexion_deg"),
-                        "right_primary_angle": rd.get("right_knee_flexion_deg"),
-                        "depth_ok": rd.get("depth_ok"),
-                    }
-                    s = scorer.score_rep(mfs, exercise_config, avg_t)
+                    s = scorer.score_rep(_scorer_input(rd), exercise_config, avg_t)
                     scored_for_fatigue.append(s)
                 cached_fatigue = fatigue_engine.compute_set_fatigue(scored_for_fatigue)
 
@@ -842,6 +939,9 @@ async def live_analysis(
                 "status": state.get("status", "Tracking"),
                 "phase": state.get("phase", "TOP_READY"),
                 "server_fps": round(fps, 1),
+                # Frames superseded in the inbox before pose could run; a
+                # rising count tells the client to lower its send rate.
+                "dropped_frames": inbox.dropped_frames,
             }
             # Log frame metrics every 30 frames to avoid spam
             if frame_idx % 30 == 0:
@@ -859,7 +959,7 @@ async def live_analysis(
                     current_form_score,
                     cached_fatigue.get("fatigue_index", 0.0),
                 )
-            await websocket.send_json(response)
+            await websocket.send_text(_encode_json(response))
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected (session_id=%s)", session_id)
@@ -875,3 +975,5 @@ async def live_analysis(
             await websocket.close(code=1011)
         except Exception:
             pass
+    finally:
+        pump.cancel()
@@ -296,27 +296,28 @@ async def get_session(
         session_id, len(resp.sets), resp.total_reps, resp.avg_form_score,
         resp.fatigue_index, resp.fatigue_risk,
     )
-    for s in resp.sets:
-        logger.info(
-            "  set %d: actual_reps=%d, avg_form=%s, load=%s, reps_count=%d",
-            s.set_number, s.actual_reps, s.avg_form_score, s.load_used,
-            len(s.reps) if s.reps else 0,
-        )
-        for r in (s.reps or []):
-            logger.info(
-                "    rep %s: composite=%s depth=%s stab=%s sym=%s "
-                "tempo=%s rom=%s | angle=%s trunk=%s depth_ok=%s",
-                r.get("rep_number") if isinstance(r, dict) else getattr(r, "rep_number", "?"),
-                r.get("form_score") if isinstance(r, dict) else getattr(r, "form_score", "?"),
-                r.get("depth_score") if isinstance(r, dict) else getattr(r, "depth_score", "?"),
-                r.get("stability_score") if isinstance(r, dict) else getattr(r, "stability_score", "?"),
-                r.get("symmetry_score") if isinstance(r, dict) else getattr(r, "symmetry_score", "?"),
-                r.get("tempo_score") if isinstance(r, dict) else getattr(r, "tempo_score", "?"),
-                r.get("rom_score") if isinstance(r, dict) else getattr(r, "rom_score", "?"),
-                r.get("depth_angle") if isinstance(r, dict) else getattr(r, "depth_angle", "?"),
-                r.get("trunk_lean") if isinstance(r, dict) else getattr(r, "trunk_lean", "?"),
-                r.get("flags") if isinstance(r, dict) else getattr(r, "flags", "?"),
+    if logger.isEnabledFor(logging.DEBUG):
+        for s in resp.sets:
+            logger.debug(
+                "  set %d: actual_reps=%d, avg_form=%s, load=%s, reps_count=%d",
+                s.set_number, s.actual_reps, s.avg_form_score, s.load_used,
+                len(s.reps) if s.reps else 0,
             )
+            for r in (s.reps or []):
+                logger.debug(
+                    "    rep %s: composite=%s depth=%s stab=%s sym=%s "
+                    "tempo=%s rom=%s | angle=%s trunk=%s depth_ok=%s",
+                    r.get("rep_number") if isinstance(r, dict) else getattr(r, "rep_number", "?"),
+                    r.get("form_score") if isinstance(r, dict) else getattr(r, "form_score", "?"),
+                    r.get("depth_score") if isinstance(r, dict) else getattr(r, "depth_score", "?"),
+                    r.get("stability_score") if isinstance(r, dict) else getattr(r, "stability_score", "?"),
+                    r.get("symmetry_score") if isinstance(r, dict) else getattr(r, "symmetry_score", "?"),
+                    r.get("tempo_score") if isinstance(r, dict) else getattr(r, "tempo_score", "?"),
+                    r.get("rom_score") if isinstance(r, dict) else getattr(r, "rom_score", "?"),
+                    r.get("depth_angle") if isinstance(r, dict) else getattr(r, "depth_angle", "?"),
+                    r.get("trunk_lean") if isinstance(r, dict) else getattr(r, "trunk_lean", "?"),
+                    r.get("flags") if isinstance(r, dict) else getattr(r, "flags", "?"),
+                )
     return resp
 
 
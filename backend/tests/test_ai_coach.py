@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 """Tests for the AI coaching module (static drill lookup only -- no LLM calls)."""
+import numpy as np
 import pytest
 
-from backend.ai.coach import get_corrective_drills, _extract_json, _validate_coaching_response
+from backend.ai import coach as coach_module
+from backend.ai.coach import (
+    ai_coach_feedback,
+    get_corrective_drills,
+    _extract_json,
+    _reps_to_arrays,
+    _summarize_session,
+    _validate_coaching_response,
+)
 
 
 class TestCorrectiveDrills:
@@ -113,3 +122,45 @@ class TestValidateCoachingResponse:
         result = _validate_coaching_response(parsed)
         assert result is not None
         assert result["recovery_suggestion"] != ""
+
+
+class TestSummarizeSession:
+    def test_flag_counts_and_averages(self):
+        reps = [
+            {"depth_ok": True, "form_ok": True, "composite_score": 80.0, "knee_flexion_deg": 95.0},
+            {"depth_ok": False, "form_ok": None, "composite_score": 60.0, "duration_ms": 2000},
+            {"depth_ok": True, "needs_review": True, "duration_sec": 1.0},
+        ]
+        summary = _summarize_session("squat", reps, [], None, None)
+        assert "Depth OK: 2/3 (66%)" in summary
+        assert "Form OK: 1/3 (33%)" in summary
+        assert "Reps flagged for review: 1/3" in summary
+        assert "Avg composite score: 70.0" in summary
+        assert "Knee flexion: 95.0 deg" in summary
+        assert "Avg rep duration: 1.50 s" in summary
+
+    def test_empty_reps(self):
+        summary = _summarize_session("squat", [], [], None, None)
+        assert "Total reps: 0" in summary
+        assert "Avg composite score" not in summary
+
+    def test_reps_to_arrays_missing_values_are_nan(self):
+        flags, values = _reps_to_arrays([{"depth_ok": 1, "speed_proxy": None, "duration_sec": 0}])
+        assert not flags["depth_ok"][0]
+        assert np.isnan(values["speed_proxy"][0])
+        assert np.isnan(values["duration_sec"][0])
+
+
+class TestAiCoachFeedback:
+    async def test_no_reps_skips_provider_call(self, monkeypatch):
+        from backend.config import settings
+
+        monkeypatch.setattr(settings, "AI_COACH_ENABLED", True)
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("provider should not be called")
+
+        monkeypatch.setattr(coach_module, "_call_openai", _fail)
+        monkeypatch.setattr(coach_module, "_call_anthropic", _fail)
+        assert await ai_coach_feedback("squat", []) is None
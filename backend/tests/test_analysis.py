@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+"""Tests for the video analysis router: upload saving and frame reading."""
+
+import io
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from backend.routers import analysis
+
+# ---------------------------------------------------------------------------
+# Upload saving
+# ---------------------------------------------------------------------------
+
+class _BrokenFile(io.BytesIO):
+    def read(self, *args):
+        raise OSError("connection reset")
+
+
+def _upload(data: bytes, file: io.BytesIO | None = None) -> UploadFile:
+    return UploadFile(file=file or io.BytesIO(data), size=len(data), filename="clip.mp4")
+
+
+async def test_upload_copied_to_temp_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(analysis, "_UPLOAD_COPY_CHUNK_BYTES", 7)
+    video = bytes(range(256)) * 40
+    path = await analysis._save_upload(_upload(video), ".mov")
+    try:
+        assert path.endswith(".mov")
+        assert Path(path).read_bytes() == video
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+async def test_oversized_upload_rejected(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(analysis, "_MAX_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(analysis.tempfile, "tempdir", str(tmp_path))
+    with pytest.raises(HTTPException) as exc_info:
+        await analysis._save_upload(_upload(b"x" * 500), ".mp4")
+    assert exc_info.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_size_cap_enforced_while_copying(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(analysis, "_MAX_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(analysis, "_UPLOAD_COPY_CHUNK_BYTES", 30)
+    monkeypatch.setattr(analysis.tempfile, "tempdir", str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(b"x" * 500), size=None, filename="clip.mp4")
+    with pytest.raises(HTTPException) as exc_info:
+        await analysis._save_upload(upload, ".mp4")
+    assert exc_info.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_failed_copy_removes_temp_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(analysis.tempfile, "tempdir", str(tmp_path))
+    with pytest.raises(HTTPException) as exc_info:
+        await analysis._save_upload(_upload(b"x" * 10, _BrokenFile()), ".mp4")
+    assert exc_info.value.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_upload_form_validation(client) -> None:
+    files = {"file": ("clip.mp4", b"x" * 10, "video/mp4")}
+    resp = await client.post("/api/v1/analysis/", files=files, data={"frame_stride": "9"})
+    assert resp.status_code == 422
+
+    files = {"file": ("notes.txt", b"hello", "text/plain")}
+    resp = await client.post("/api/v1/analysis/", files=files)
+    assert resp.status_code == 415
+
+
+# ---------------------------------------------------------------------------
+# Background frame reader
+# ---------------------------------------------------------------------------
+
+class _FailingCapture:
+    """Capture that yields *n_ok* frames and then raises from ``read()``."""
+
+    def __init__(self, n_ok: int) -> None:
+        self._left = n_ok
+
+    def read(self):
+        if self._left == 0:
+            raise RuntimeError("corrupt stream")
+        self._left -= 1
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def grab(self) -> bool:
+        return True
+
+
+def test_reader_failure_ends_stream_and_propagates() -> None:
+    frames: queue.Queue = queue.Queue(maxsize=8)
+    stats = analysis._ReaderStats()
+    reader = threading.Thread(
+        target=analysis._read_frames,
+        args=(_FailingCapture(3), frames, threading.Event(), 1, stats),
+    )
+    reader.start()
+    received = []
+    with pytest.raises(RuntimeError, match="corrupt stream"):
+        for frame in analysis._iter_frames(frames, stats):
+            received.append(frame)
+    reader.join(timeout=5)
+    assert not reader.is_alive()
+    assert len(received) == 3
+
+
+class _EndingCapture:
+    """Capture with *n* frames, then EOF."""
+
+    def __init__(self, n: int) -> None:
+        self._left = n
+
+    def read(self):
+        if self._left == 0:
+            return False, None
+        self._left -= 1
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def grab(self) -> bool:
+        if self._left == 0:
+            return False
+        self._left -= 1
+        return True
+
+
+def test_reader_counts_source_frames_with_stride() -> None:
+    frames: queue.Queue = queue.Queue()
+    stats = analysis._ReaderStats()
+    analysis._read_frames(_EndingCapture(10), frames, threading.Event(), 3, stats)
+    analysed = list(analysis._iter_frames(frames, stats))
+    assert len(analysed) == 4  # source frames 0, 3, 6, 9
+    assert stats.source_frames == 10
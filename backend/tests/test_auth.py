@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+"""Tests for the main-app authentication helpers."""
+
+
+def test_reset_email_escapes_url() -> None:
+    """Quotes, ampersands and angle brackets in the reset link are HTML-escaped."""
+    from backend.routers.auth import _build_reset_html
+
+    html = _build_reset_html('https://example.com/reset?token=a"b&x=<y>\'')
+    assert 'href="https://example.com/reset?token=a&quot;b&amp;x=&lt;y&gt;&#x27;"' in html
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+"""Tests for the coaching router's AI feedback generation and caching."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.routers import coach as coach_router
+
+_COACHING = {"coaching_cues": ["Keep your chest up"], "drill": "Box squat"}
+
+
+async def _create_user_session(db: AsyncSession) -> tuple[Any, Any, str]:
+    from backend.models.session import Session
+    from backend.models.user import User
+    from backend.routers.auth import _create_access_token
+
+    user = User(email="coach@example.com", name="Coach Test")
+    db.add(user)
+    await db.flush()
+    session = Session(user_id=user.id, exercise_type="squat", total_reps=5, total_sets=1)
+    db.add(session)
+    await db.commit()
+    return user, session, _create_access_token(user.id)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Replace the AI coach with a slow fake that records its calls."""
+    from backend.tests.conftest import TestSessionLocal
+
+    calls: list[dict[str, Any]] = []
+
+    async def _fake_feedback(**kwargs: Any) -> dict[str, Any]:
+        calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        return dict(_COACHING)
+
+    monkeypatch.setattr(coach_router, "ai_coach_feedback", _fake_feedback)
+    monkeypatch.setattr(coach_router, "AsyncSessionLocal", TestSessionLocal)
+    return calls
+
+
+async def test_concurrent_requests_share_one_llm_call(
+    db: AsyncSession, fake_llm: list[dict[str, Any]],
+) -> None:
+    _, session, _ = await _create_user_session(db)
+
+    tasks = [
+        coach_router._schedule_coaching(session.id, {"exercise_type": "squat"})
+        for _ in range(3)
+    ]
+    results = await asyncio.gather(*tasks)
+
+    assert len(fake_llm) == 1
+    assert results == [_COACHING] * 3
+    assert coach_router._inflight_coaching == {}
+
+
+async def test_latest_answers_pending_then_serves_stored(
+    client: AsyncClient,
+    db: AsyncSession,
+    fake_llm: list[dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The first request does not wait for the LLM; a later poll gets the stored result."""
+    from backend.models.rep import Rep
+    from backend.models.session import Set
+
+    monkeypatch.setattr(coach_router.settings, "AI_COACH_ENABLED", True)
+    _, session, token = await _create_user_session(db)
+    set_ = Set(session_id=session.id, set_number=1)
+    db.add(set_)
+    await db.flush()
+    db.add(Rep(set_id=set_.id, session_id=session.id, rep_number=1, composite_score=80.0))
+    await db.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = await client.get("/api/v1/coach/latest", headers=headers)
+    assert first.status_code == 200
+    assert first.json()["coaching_status"] == "pending"
+    assert first.json()["coaching"] is None
+
+    await asyncio.gather(*coach_router._inflight_coaching.values())
+
+    second = await client.get("/api/v1/coach/latest", headers=headers)
+    assert second.status_code == 200
+    assert second.json()["coaching_status"] == "ready"
+    assert second.json()["coaching"] == _COACHING
+    assert len(fake_llm) == 1
+
+
+async def test_latest_without_ai_coach_is_unavailable(
+    client: AsyncClient, db: AsyncSession, fake_llm: list[dict[str, Any]],
+) -> None:
+    _, _, token = await _create_user_session(db)
+
+    resp = await client.get(
+        "/api/v1/coach/latest", headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["coaching_status"] == "unavailable"
+    assert resp.json()["cues"]
+    assert fake_llm == []
+    assert coach_router._inflight_coaching == {}
+
+
+async def test_failed_generation_is_logged_and_cleared(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, session, _ = await _create_user_session(db)
+
+    async def _failing_feedback(**kwargs: Any) -> dict[str, Any]:
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(coach_router, "ai_coach_feedback", _failing_feedback)
+    task = coach_router._schedule_coaching(session.id, {})
+    with pytest.raises(RuntimeError):
+        await task
+    await asyncio.sleep(0)
+    assert coach_router._inflight_coaching == {}
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+"""Tests for the /api/v1/exercises/ catalogue endpoint."""
+
+from httpx import AsyncClient
+
+
+async def test_list_exercises_identity(client: AsyncClient) -> None:
+    """Without gzip in Accept-Encoding the plain JSON body is returned."""
+    resp = await client.get("/api/v1/exercises/", headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert len(resp.json()["exercises"]) == 8
+
+
+async def test_list_exercises_gzip(client: AsyncClient) -> None:
+    """Clients accepting gzip get the precompressed body."""
+    plain = await client.get("/api/v1/exercises/", headers={"Accept-Encoding": "identity"})
+    resp = await client.get("/api/v1/exercises/", headers={"Accept-Encoding": "gzip, deflate"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(plain.content)
+    assert resp.json() == plain.json()
+
+
+async def test_list_exercises_gzip_refused(client: AsyncClient) -> None:
+    """``gzip;q=0`` opts out of compression."""
+    resp = await client.get("/api/v1/exercises/", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in resp.headers
+
+
+async def test_list_exercises_etag_revalidation(client: AsyncClient) -> None:
+    """A matching If-None-Match yields 304 with no body."""
+    resp = await client.get("/api/v1/exercises/", headers={"Accept-Encoding": "identity"})
+    etag = resp.headers["etag"]
+    assert "max-age" in resp.headers["cache-control"]
+
+    cached = await client.get(
+        "/api/v1/exercises/",
+        headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    gzipped = await client.get(
+        "/api/v1/exercises/",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert gzipped.status_code == 200
+    assert gzipped.headers["etag"] != etag
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 """Tests for per-frame biomechanics metrics computation."""
+import numpy as np
 import pytest
 
-from backend.core.frame_metrics import compute_baseline, compute_frame_metrics
+from backend.core.frame_metrics import (
+    compute_baseline,
+    compute_frame_metrics,
+    compute_frame_metrics_batch,
+    knee_flexion_deg_batch,
+)
+from backend.core.geometry import (
+    angle_deg,
+    angle_deg_3d,
+    angle_deg_batch,
+    hip_y_norm,
+    hip_y_norm_batch,
+)
 
 
 def _make_keypoints(
@@ -103,3 +116,72 @@ class TestComputeBaseline:
         baseline = compute_baseline(samples)
         assert baseline["knee_flexion_deg"] is not None
         assert baseline["trunk_angle_deg"] is None
+
+
+class TestAngleDeg:
+    def test_right_and_straight_angles(self):
+        assert angle_deg((1.0, 0.0), (0.0, 0.0), (0.0, 1.0)) == pytest.approx(90.0)
+        assert angle_deg((-1.0, 0.0), (0.0, 0.0), (1.0, 0.0)) == pytest.approx(180.0)
+        assert angle_deg_3d((1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 2.0)) == pytest.approx(90.0)
+
+    def test_zero_length_side_is_none(self):
+        assert angle_deg((1.0, 1.0), (1.0, 1.0), (2.0, 3.0)) is None
+        assert angle_deg_3d((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)) is None
+
+    def test_batch_matches_scalar(self):
+        pts = np.array([
+            [[1.0, 0.0], [0.0, 0.0], [0.0, 1.0]],
+            [[3.0, 4.0], [1.0, 1.0], [-2.0, 5.0]],
+            [[1.0, 1.0], [1.0, 1.0], [2.0, 3.0]],
+        ])
+        out = angle_deg_batch(pts[:, 0], pts[:, 1], pts[:, 2])
+        assert out[0] == pytest.approx(90.0)
+        assert out[1] == pytest.approx(angle_deg(*map(tuple, pts[1])))
+        assert np.isnan(out[2])
+
+
+class TestHipYNormBatch:
+    def test_matches_scalar(self):
+        frames = [_make_keypoints(hip_y=h) for h in (0.45, 0.55, 0.65)]
+        batch = hip_y_norm_batch(np.array(frames))
+        assert batch.tolist() == [hip_y_norm(kp) for kp in frames]
+
+    def test_missing_frame_is_nan(self):
+        arr = np.full((2, 33, 2), np.nan)
+        arr[0] = _make_keypoints()
+        result = hip_y_norm_batch(arr)
+        assert np.isfinite(result[0])
+        assert np.isnan(result[1])
+
+
+class TestComputeFrameMetricsBatch:
+    def test_matches_scalar_angles(self):
+        frames = [
+            _make_keypoints(),
+            _make_keypoints(hip_y=0.68, knee_y=0.7),
+            _make_keypoints(shoulder_y=0.4, x_spread=0.05),
+        ]
+        batch = compute_frame_metrics_batch(np.array(frames))
+        for i, kp in enumerate(frames):
+            scalar = compute_frame_metrics(kp)
+            for key, values in batch.items():
+                assert values[i] == pytest.approx(scalar[key]), key
+
+    def test_knee_flexion_kernel_matches_full_batch(self):
+        arr = np.array([_make_keypoints(), _make_keypoints(hip_y=0.68, knee_y=0.7)])
+        np.testing.assert_array_equal(
+            knee_flexion_deg_batch(arr), compute_frame_metrics_batch(arr)["knee_flexion_deg"],
+        )
+
+    def test_degenerate_angle_is_nan(self):
+        arr = np.array([[(0.5, 0.5)] * 33])
+        batch = compute_frame_metrics_batch(arr)
+        assert np.isnan(batch["knee_angle_deg"][0])
+        assert np.isnan(batch["trunk_angle_deg"][0])
+
+    def test_com_offset_matches_scalar(self):
+        frames = [_make_keypoints(), _make_keypoints(x_spread=0.2)]
+        batch = compute_frame_metrics_batch(np.array(frames))
+        for i, kp in enumerate(frames):
+            expected = compute_frame_metrics(kp)["com_offset_norm"]
+            assert batch["com_offset_norm"][i] == pytest.approx(expected)
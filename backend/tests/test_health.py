@@ -2,8 +2,11 @@ from __future__ import annotations
 
 """Tests for the /api/v1/health endpoint."""
 
+import pytest
 from httpx import AsyncClient
 
+import backend.db.engine as db_engine
+
 
 async def test_health_check(client: AsyncClient) -> None:
     """GET /api/v1/health should return 200 with database connected."""
@@ -12,3 +15,19 @@ async def test_health_check(client: AsyncClient) -> None:
     data = resp.json()
     assert data["status"] == "ok"
     assert data["database"] == "connected"
+    assert resp.headers["cache-control"] == "no-store"
+
+
+async def test_health_check_degraded(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """GET /api/v1/health should return 503 when the database is unreachable."""
+
+    def _unreachable():
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(db_engine, "AsyncSessionLocal", _unreachable)
+    resp = await client.get("/api/v1/health")
+    assert resp.status_code == 503
+    assert resp.json() == {"status": "degraded", "database": "unreachable"}
+    assert resp.headers["cache-control"] == "no-store"
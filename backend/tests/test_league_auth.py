@@ -110,3 +110,11 @@ async def test_duplicate_nickname(client: AsyncClient) -> None:
     )
     assert resp.status_code == 409
     assert "already taken" in resp.json()["detail"].lower()
+
+
+def test_reset_email_escapes_url() -> None:
+    """Query-string separators in the reset link are HTML-escaped in the href."""
+    from backend.routers.league_auth import _build_reset_html
+
+    html = _build_reset_html('https://example.com/reset?token=a"b&type=league')
+    assert 'href="https://example.com/reset?token=a&quot;b&amp;type=league"' in html
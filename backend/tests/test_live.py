@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+"""Tests for the live router's frame throttle and inbound message inbox."""
+
+import asyncio
+
+import pytest
+
+from backend.routers.live import _FrameInbox, _FrameThrottle
+
+
+def _frame(tag: bytes) -> dict:
+    return {"type": "websocket.receive", "bytes": tag}
+
+
+def _text(tag: str) -> dict:
+    return {"type": "websocket.receive", "text": tag}
+
+
+class TestFrameThrottle:
+    def test_rejects_frames_inside_the_interval(self):
+        throttle = _FrameThrottle(0.1)
+        assert throttle.admit(10.0)
+        assert not throttle.admit(10.05)
+        assert throttle.admit(10.1)
+
+    def test_holds_the_cap_for_jittery_arrivals(self):
+        # Frames every 0.06 s against a 0.08 s cap: a "since last frame"
+        # rule admits every other frame (8.3 fps); the schedule holds 12.5.
+        throttle = _FrameThrottle(0.08)
+        admitted = sum(throttle.admit(i * 0.06) for i in range(1, 1001))
+        assert admitted == pytest.approx(60.0 / 0.08, abs=2)
+
+    def test_restarts_schedule_after_a_stall(self):
+        throttle = _FrameThrottle(0.1)
+        assert throttle.admit(1.0)
+        # A five second gap must not bank slots for a burst afterwards.
+        assert throttle.admit(6.0)
+        assert not throttle.admit(6.01)
+        assert not throttle.admit(6.05)
+
+
+class TestFrameInbox:
+    async def test_coalesces_waiting_binary_frames(self):
+        inbox = _FrameInbox()
+        inbox.put(_frame(b"1"))
+        inbox.put(_frame(b"2"))
+        inbox.put(_frame(b"3"))
+        assert (await inbox.get())["bytes"] == b"3"
+        assert inbox.dropped_frames == 2
+
+    async def test_keeps_text_messages_in_order(self):
+        inbox = _FrameInbox()
+        inbox.put(_text("a"))
+        inbox.put(_frame(b"1"))
+        inbox.put(_text("b"))
+        inbox.put(_frame(b"2"))
+        got = [await inbox.get() for _ in range(4)]
+        assert [m.get("text") or m.get("bytes") for m in got] == ["a", b"1", "b", b"2"]
+        assert inbox.dropped_frames == 0
+
+    async def test_get_waits_for_a_message(self):
+        inbox = _FrameInbox()
+        waiter = asyncio.create_task(inbox.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        inbox.put(_frame(b"1"))
+        assert (await asyncio.wait_for(waiter, 1.0))["bytes"] == b"1"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+"""Tests for pose input preparation and model download (no MediaPipe model required)."""
+
+import hashlib
+import io
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from backend.core import pose as pose_mod
+from backend.core.pose import process_frame
+
+
+class _BlobPose:
+    """Legacy-API stand-in that "detects" the centroid of a bright blob.
+
+    Every landmark is placed at the blob's normalised centre, which is
+    enough to check that pixel coordinates survive the input downscale.
+    """
+
+    def __init__(self, max_input_width: int | None = None) -> None:
+        self.input_shapes: list[tuple[int, ...]] = []
+        if max_input_width is not None:
+            self._max_input_width = max_input_width
+
+    def process(self, rgb: np.ndarray):
+        self.input_shapes.append(rgb.shape)
+        gray = rgb[..., 0].astype(np.float64)
+        ys, xs = np.nonzero(gray > 127)
+        h, w = gray.shape
+        lm = SimpleNamespace(x=(xs.mean() + 0.5) / w, y=(ys.mean() + 0.5) / h)
+        return SimpleNamespace(
+            pose_landmarks=SimpleNamespace(landmark=[lm] * 33),
+            pose_world_landmarks=None,
+        )
+
+
+def _frame_with_blob(w: int, h: int, cx: int, cy: int) -> np.ndarray:
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    cv2.circle(frame, (cx, cy), 20, (255, 255, 255), -1)
+    return frame
+
+
+def test_small_frames_are_not_resized() -> None:
+    pose = _BlobPose()
+    process_frame(_frame_with_blob(640, 480, 300, 200), pose)
+    assert pose.input_shapes == [(480, 640, 3)]
+
+
+def test_wide_frames_downscaled_by_integer_factor() -> None:
+    pose = _BlobPose()
+    process_frame(_frame_with_blob(1920, 1080, 900, 500), pose)
+    assert pose.input_shapes == [(360, 640, 3)]
+
+
+def test_max_input_width_is_configurable() -> None:
+    full = _BlobPose(max_input_width=0)
+    process_frame(_frame_with_blob(1920, 1080, 900, 500), full)
+    assert full.input_shapes == [(1080, 1920, 3)]
+
+    half = _BlobPose(max_input_width=960)
+    process_frame(_frame_with_blob(1920, 1080, 900, 500), half)
+    assert half.input_shapes == [(540, 960, 3)]
+
+
+def test_downscaled_landmarks_match_full_resolution() -> None:
+    """Landmarks from the shrunk frame land within a pixel or two of full-res ones."""
+    frame = _frame_with_blob(1920, 1080, 1234, 567)
+    full = process_frame(frame, _BlobPose(max_input_width=0))
+    small = process_frame(frame, _BlobPose())
+    assert full is not None and small is not None
+    np.testing.assert_allclose(full["keypoints_2d"][0], (1234.5, 567.5), atol=0.5)
+    np.testing.assert_allclose(small["keypoints_2d"], full["keypoints_2d"], atol=2.0)
+
+
+
+class _FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TestDownloadModel:
+    _PAYLOAD = b"model bytes" * 1000
+
+    def _serve(self, monkeypatch, sha256: str) -> None:
+        monkeypatch.setattr(pose_mod, "_POSE_MODEL_SHA256", sha256)
+        monkeypatch.setattr(
+            pose_mod.urllib.request, "urlopen",
+            lambda url, timeout: _FakeResponse(self._PAYLOAD),
+        )
+
+    def test_installs_model_with_matching_checksum(self, tmp_path, monkeypatch):
+        self._serve(monkeypatch, hashlib.sha256(self._PAYLOAD).hexdigest())
+        path = tmp_path / "model.task"
+        pose_mod._download_model(path)
+        assert path.read_bytes() == self._PAYLOAD
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_rejects_checksum_mismatch(self, tmp_path, monkeypatch):
+        self._serve(monkeypatch, "0" * 64)
+        path = tmp_path / "model.task"
+        with pytest.raises(RuntimeError, match="checksum mismatch"):
+            pose_mod._download_model(path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_keeps_existing_model_on_mismatch(self, tmp_path, monkeypatch):
+        self._serve(monkeypatch, "0" * 64)
+        path = tmp_path / "model.task"
+        path.write_bytes(b"good model")
+        with pytest.raises(RuntimeError):
+            pose_mod._download_model(path)
+        assert path.read_bytes() == b"good model"
+        assert list(tmp_path.iterdir()) == [path]
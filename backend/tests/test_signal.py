@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+"""Tests for rep-signal helpers."""
+import numpy as np
+
+from backend.core.signal import median_filter
+
+
+class TestMedianFilter:
+    def test_matches_truncated_window_median(self):
+        x = np.array([5.0, 1.0, np.nan, 4.0, 2.0, 8.0, np.nan, np.nan, 3.0])
+        expected = [np.nanmedian(x[max(0, i - 2):i + 3]) for i in range(len(x))]
+        np.testing.assert_array_equal(median_filter(x, 5), expected)
+
+    def test_all_nan_window_stays_nan(self):
+        x = np.array([1.0, np.nan, np.nan, np.nan, np.nan, 2.0])
+        out = median_filter(x, 3)
+        assert np.isnan(out[2]) and np.isnan(out[3])
+        assert out[0] == 1.0 and out[5] == 2.0
+
+    def test_invalid_window_returns_input(self):
+        x = np.array([1.0, 2.0, 3.0])
+        assert median_filter(x, 4) is x
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+"""Tests for EMA keypoint smoothing."""
+import numpy as np
+
+from backend.core.smoothing import OneEuroFilter, smooth_keypoints_ema
+
+
+def _keypoints(offset: float, dims: int = 2) -> list[tuple[float, ...]]:
+    return [tuple(float(i + offset + d) for d in range(dims)) for i in range(33)]
+
+
+class TestSmoothKeypointsEma:
+    def test_first_frame_passthrough(self):
+        kp = np.array(_keypoints(0.0))
+        assert smooth_keypoints_ema(kp, None) is kp
+
+    def test_array_matches_list(self):
+        cur, prev = _keypoints(1.0), _keypoints(0.0)
+        expected = smooth_keypoints_ema(cur, prev, alpha=0.3)
+        result = smooth_keypoints_ema(np.array(cur), np.array(prev), alpha=0.3)
+        assert result.shape == (33, 2)
+        np.testing.assert_allclose(result, np.array(expected))
+
+
+class TestOneEuroFilter:
+    def test_first_frame_passthrough(self):
+        kp = np.array(_keypoints(0.0))
+        np.testing.assert_array_equal(OneEuroFilter()(kp, 1 / 15), kp)
+
+    def test_holds_still_pose(self):
+        f = OneEuroFilter()
+        kp = np.array(_keypoints(0.0))
+        for _ in range(5):
+            out = f(kp, 1 / 15)
+        np.testing.assert_allclose(out, kp)
+
+    def test_tracks_fast_motion_closer_than_fixed_cutoff(self):
+        adaptive = OneEuroFilter(beta=0.02)
+        fixed = OneEuroFilter(beta=0.0)
+        kp = np.array(_keypoints(0.0))
+        adaptive(kp, 1 / 15)
+        fixed(kp, 1 / 15)
+        for step in range(1, 6):
+            moved = kp + 20.0 * step
+            a = adaptive(moved, 1 / 15)
+            b = fixed(moved, 1 / 15)
+        assert np.abs(moved - a).max() < np.abs(moved - b).max()
+
+    def test_reset_forgets_state(self):
+        f = OneEuroFilter()
+        f(np.array(_keypoints(0.0)), 1 / 15)
+        f.reset()
+        kp = np.array(_keypoints(50.0))
+        np.testing.assert_array_equal(f(kp, 1 / 15), kp)
+
+    def test_non_positive_dt_holds_estimate(self):
+        f = OneEuroFilter()
+        kp = np.array(_keypoints(0.0))
+        f(kp, 1 / 15)
+        held = f(kp + 100.0, 0.0)
+        np.testing.assert_array_equal(held, kp)
+        # The held frame did not reset the state: the next step is smoothed.
+        assert np.abs(f(kp + 100.0, 1 / 15) - kp).max() < 100.0
+
+    def test_returned_array_is_not_filter_state(self):
+        f = OneEuroFilter()
+        kp = np.array(_keypoints(0.0))
+        out = f(kp, 1 / 15)
+        out += 1000.0
+        np.testing.assert_allclose(f(kp, 1 / 15), kp)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+"""Tests for the Content-Length upload guard on video analysis."""
+
+from backend.main import UploadSizeLimitMiddleware, create_app
+
+
+async def _call(path: str, length: int | None) -> tuple[list[dict], bool]:
+    called = False
+
+    async def app(scope, receive, send):
+        nonlocal called
+        called = True
+
+    async def receive():
+        raise AssertionError("body must not be read")
+
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    headers = [] if length is None else [(b"content-length", str(length).encode())]
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    await UploadSizeLimitMiddleware(app, path="/api/v1/analysis/", max_bytes=1000)(
+        scope, receive, send,
+    )
+    return sent, called
+
+
+async def test_oversized_upload_rejected_before_body() -> None:
+    sent, called = await _call("/api/v1/analysis/", 5000)
+    assert not called
+    assert sent[0]["status"] == 413
+
+
+async def test_within_limit_passes_through() -> None:
+    sent, called = await _call("/api/v1/analysis/", 500)
+    assert called and not sent
+
+
+async def test_missing_length_and_other_paths_pass_through() -> None:
+    assert (await _call("/api/v1/analysis/", None))[1]
+    assert (await _call("/api/v1/sessions/", 5000))[1]
+
+
+def test_guard_covers_the_upload_route() -> None:
+    app = create_app()
+    guard = next(m for m in app.user_middleware if m.cls is UploadSizeLimitMiddleware)
+    assert guard.kwargs["path"] == app.url_path_for("upload_video")
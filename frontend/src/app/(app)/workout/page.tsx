@@ -46,6 +46,11 @@ const POSE_CONNECTIONS: [number, number][] = [
   [28, 30], [30, 32], // right foot
 ];
 
+const POSE_LANDMARK_COUNT = 33;
+
+// Joints touched by a connection; these get a dot drawn on them.
+const POSE_JOINTS: number[] = Array.from(new Set(POSE_CONNECTIONS.flat()));
+
 // ---------------------------------------------------------------------------
 // Interfaces
 // ---------------------------------------------------------------------------
@@ -515,15 +520,21 @@ function WorkoutContent() {
     const ctx = canvas.getContext("2d");
     if (!ctx) return;
 
-    // Match canvas to video display size
+    // Match canvas to video display size. Assigning width/height reallocates
+    // (and clears) the backing store, so only do it when the size changes.
     const rect = video.getBoundingClientRect();
-    canvas.width = rect.width;
-    canvas.height = rect.height;
-
-    // Clear previous frame
-    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    const width = Math.round(rect.width);
+    const height = Math.round(rect.height);
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    } else {
+      // Clear previous frame
+      ctx.clearRect(0, 0, width, height);
+    }
 
-    if (!landmarks || landmarks.length === 0) return;
+    // Every connection index is below 33, so one length check covers all edges
+    if (!landmarks || landmarks.length < POSE_LANDMARK_COUNT) return;
 
     const color = getSkeletonColor(metrics.form_score);
 
@@ -532,48 +543,33 @@ function WorkoutContent() {
     ctx.lineWidth = 3;
     ctx.lineCap = "round";
 
+    // All bones go into one path so the canvas strokes once per frame
+    ctx.beginPath();
     for (const [startIdx, endIdx] of POSE_CONNECTIONS) {
       const start = landmarks[startIdx];
       const end = landmarks[endIdx];
-      if (!start || !end) continue;
-
-      const x1 = start[0] * canvas.width;
-      const y1 = start[1] * canvas.height;
-      const x2 = end[0] * canvas.width;
-      const y2 = end[1] * canvas.height;
-
-      ctx.beginPath();
-      ctx.moveTo(x1, y1);
-      ctx.lineTo(x2, y2);
-      ctx.stroke();
+      ctx.moveTo(start[0] * width, start[1] * height);
+      ctx.lineTo(end[0] * width, end[1] * height);
     }
+    ctx.stroke();
 
-    // Draw landmark dots
-    ctx.fillStyle = color;
-    const relevantLandmarks = new Set<number>();
-    for (const [a, b] of POSE_CONNECTIONS) {
-      relevantLandmarks.add(a);
-      relevantLandmarks.add(b);
-    }
-
-    for (const idx of relevantLandmarks) {
+    // Draw landmark dots: one fill for the outer dots, one for the white centres
+    const dots = new Path2D();
+    const centres = new Path2D();
+    for (const idx of POSE_JOINTS) {
       const lm = landmarks[idx];
-      if (!lm) continue;
+      const x = lm[0] * width;
+      const y = lm[1] * height;
 
-      const x = lm[0] * canvas.width;
-      const y = lm[1] * canvas.height;
-
-      ctx.beginPath();
-      ctx.arc(x, y, 5, 0, 2 * Math.PI);
-      ctx.fill();
-
-      // White inner dot
-      ctx.fillStyle = "white";
-      ctx.beginPath();
-      ctx.arc(x, y, 2, 0, 2 * Math.PI);
-      ctx.fill();
-      ctx.fillStyle = color;
+      dots.moveTo(x + 5, y);
+      dots.arc(x, y, 5, 0, 2 * Math.PI);
+      centres.moveTo(x + 2, y);
+      centres.arc(x, y, 2, 0, 2 * Math.PI);
     }
+    ctx.fillStyle = color;
+    ctx.fill(dots);
+    ctx.fillStyle = "white";
+    ctx.fill(centres);
   }, [landmarks, metrics.form_score, videoRef]);
 
   // -------------------------------------------------------------------------
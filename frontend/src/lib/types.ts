@@ -332,6 +332,9 @@ export interface AnalysisJobCompleted {
     total_reps: number;
     fps: number;
     total_frames: number;
+    frame_stride: number;
+    effective_fps: number;
+    analyzed_frames: number;
     avg_form_score: number | null;
     fatigue_index: number | null;
     fatigue_risk: string | null;